@@ -0,0 +1,150 @@
+import os
+# jobs are only saved, so the GUI backends aren't even probed
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import shlex
+import sys
+import time
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib.pyplot as plt
+
+import plotme
+
+
+def load_manifest(path):
+    """
+    Reads the jobs of a manifest file. JSON and YAML manifests are a list of jobs (or a dictionary with a 'jobs' list),
+    where each job is a dictionary of options. CSV manifests have the options as the header and one job per row
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline='') as f:
+        if extension == '.csv':
+            # empty cells are options that weren't set for that job
+            return [{key: value for key, value in row.items() if value not in ('', None)} for row in csv.DictReader(f)]
+        if extension in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError('PyYAML is needed to read YAML manifests')
+            jobs = yaml.safe_load(f)
+        else:
+            jobs = json.load(f)
+
+    if isinstance(jobs, dict):
+        jobs = jobs['jobs']
+    return jobs
+
+
+def to_bool(value):
+    if isinstance(value, str):
+        return value.strip().lower() in ('true', 'yes', '1', 'y')
+    return bool(value)
+
+
+def job_arguments(job, parser):
+    """
+    Converts a job to the list of command line arguments of plotme. The options can be given by their long names
+    (fileName, standardDeviation) or by their short ones (f, sd)
+    """
+    actions = {}
+    for action in parser._actions:
+        for option in action.option_strings:
+            actions[option.lstrip('-')] = action
+
+    argv = []
+    for key, value in job.items():
+        if key not in actions:
+            raise ValueError(f'Unknown option {key}')
+        action = actions[key]
+        option = action.option_strings[-1]
+
+        # flags are only added when they are true
+        if action.nargs == 0:
+            if to_bool(value):
+                argv.append(option)
+        elif action.nargs == '+':
+            # lists can be given as lists or as strings separated by spaces
+            values = value if isinstance(value, list) else shlex.split(str(value))
+            argv.append(option)
+            argv.extend(str(val) for val in values)
+        elif value is not None:
+            argv.extend([option, str(value)])
+
+    return argv
+
+
+def run_job(index, job, overwrite=False):
+    """
+    Renders a single job. Errors are returned instead of raised, so a bad job doesn't stop the others
+    """
+    start = time.perf_counter()
+    output = io.StringIO()
+    # plotme asks before overwriting a named output, which can't be answered in a batch, so the question is either
+    # answered with yes or gets an EOF and the job fails instead of waiting forever
+    stdin, sys.stdin = sys.stdin, io.StringIO('yes\n' if overwrite else '')
+    try:
+        with contextlib.redirect_stdout(output):
+            plotme.main(job_arguments(job, plotme.Plot.createParser()))
+        error = None
+    except SystemExit as e:
+        # plotme prints the reason before leaving
+        lines = output.getvalue().strip().splitlines()
+        error = lines[-1] if lines else f'exited with code {e.code}'
+    except EOFError:
+        error = 'The output file already exists'
+    except Exception as e:
+        error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+    finally:
+        sys.stdin = stdin
+        plt.close('all')
+
+    return index, error, output.getvalue(), time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    prs = argparse.ArgumentParser(description='Batch Module - Renders all the plots of a manifest in a single process.')
+    prs.add_argument('manifest', type=str,
+                     help='JSON, YAML or CSV file with one job per entry, using the same options as plotme.py.')
+    prs.add_argument('-w', '--workers', type=int, default=1,
+                     help='Number of processes rendering the jobs. Values lower than 1 use all the available cores.')
+    prs.add_argument('-ow', '--overwrite', action='store_true', default=False,
+                     help='Replaces output files that already exist, instead of failing those jobs.')
+    prs.add_argument('-r', '--report', type=str, default=None,
+                     help='JSON file where the result of every job is saved.')
+    args = prs.parse_args()
+
+    jobs = load_manifest(args.manifest)
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+
+    if workers == 1:
+        results = (run_job(index, job, args.overwrite) for index, job in enumerate(jobs))
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(run_job, range(len(jobs)), jobs, [args.overwrite] * len(jobs))
+
+    report = []
+    for index, error, output, elapsed in results:
+        status = 'ok' if error is None else 'failed'
+        print(f'[{status}] job {index + 1}/{len(jobs)} ({elapsed:.2f}s)' + (f': {error}' if error else ''))
+        if error is None and output.strip():
+            print(output.rstrip())
+        report.append({'job': index, 'options': jobs[index], 'status': status, 'error': error, 'seconds': elapsed})
+
+    if workers != 1:
+        executor.shutdown()
+
+    failed = sum(result['status'] == 'failed' for result in report)
+    print(f'{len(report) - failed} jobs succeeded, {failed} failed')
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=4, default=str)
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,196 @@
+import os
+# the benchmarks only save the figures, so the GUI backends aren't even probed
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import plotme
+
+BENCHMARKS = ['openFile', 'plotSD', 'plotLine', 'plotScatter', 'moving_average', 'exportFile', 'integrate_files']
+
+
+def generate_dataset(directory, rows, columns, files, separator=',', seed=0):
+    """
+    Writes files with a step column and columns of random walks. The same arguments always write the same bytes, so the
+    runs of different versions read exactly the same data
+    """
+    paths = []
+    for i in range(files):
+        rng = np.random.default_rng(seed + i)
+        values = np.cumsum(rng.normal(size=(rows, columns)), axis=0)
+        df = pd.DataFrame(values, columns=[f'value{j}' for j in range(1, columns + 1)])
+        df.insert(0, 'step', np.arange(rows))
+        path = os.path.join(directory, f'data{i}.csv')
+        df.to_csv(path, sep=separator, index=False, float_format='%.6f')
+        paths.append(path)
+    return paths
+
+
+def measure(function, repeat, setup=None, teardown=None):
+    """Runs the function repeat times and returns the duration of each run. Only the function itself is timed"""
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function(state)
+        times.append(time.perf_counter() - start)
+        if teardown:
+            teardown(state)
+    return times
+
+
+def run_benchmarks(files, args):
+    """Times every hot path of plotme on the generated files. Returns a dictionary with the times of each benchmark"""
+    plt = plotme.load_pyplot()
+    import seaborn as sns
+    sns.set()
+
+    y = f'2-{args.columns + 1}' if args.columns > 1 else '2'
+    options = {'separator': args.separator, 'y': y}
+    data = plotme.Plot(fileName=files, sd=True, **options).data
+    results = {}
+
+    def figure(state=None):
+        return plt.subplots(constrained_layout=True)
+
+    def close(state):
+        plt.close('all')
+
+    def add(name, function, setup=None, teardown=None):
+        if name.split('[')[0] in args.benchmarks:
+            results[name] = measure(function, args.repeat, setup, teardown)
+            print(f'{name}: median {statistics.median(results[name]):.4f}s, best {min(results[name]):.4f}s')
+
+    reader = plotme.Plot(data=data, fileName=files, sd=True, **options)
+    add('openFile', lambda state: reader.openFile(files))
+
+    sd = plotme.Plot(data=data, fileName=files, sd=True, **options)
+    add('plotSD', lambda state: sd.plotSD(sd.data, sd.yPos, state[1]), figure, close)
+
+    line = plotme.Plot(data=data[0], fileName=files[0], **options)
+    add('plotLine', lambda state: line.plotLine(line.data[0], *state), figure, close)
+
+    # the same symbol size the command line gives
+    scatter = plotme.Plot(data=data[0], fileName=files[0], graphType='scatter', symbolSize='2', **options)
+    add('plotScatter', lambda state: scatter.plotScatter(scatter.data[0], *state), figure, close)
+
+    values = data[0].iloc[:, line.yPos]
+    add('moving_average', lambda state: line.moving_average(values, args.window))
+
+    # the figures are saved with new names, so plotme never asks about replacing a file
+    counter = iter(range(sys.maxsize))
+
+    def drawn(state=None):
+        fig, ax1 = figure()
+        with contextlib.redirect_stdout(io.StringIO()):
+            line.plotLine(line.data[0], fig, ax1)
+        return fig
+
+    here = os.getcwd()
+    os.chdir(os.path.dirname(files[0]))
+    try:
+        for fmt in args.formats:
+            add(f'exportFile[{fmt}]', lambda fig: line.exportFile(f'export{next(counter)}.{fmt}', 'data', fig), drawn,
+                close)
+    finally:
+        os.chdir(here)
+
+    integral = plotme.Integral(file=data, y=list(range(1, args.columns + 1)), x=0)
+    add('integrate_files', lambda state: integral.integrate_files())
+
+    return results
+
+
+def summarize(times):
+    return {'median': statistics.median(times), 'best': min(times), 'runs': times}
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares the medians of the results with the ones of the baseline. Returns the benchmarks that got slower than the
+    threshold (a fraction of the baseline time)
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]['median'], result['median']
+        change = after / before - 1 if before > 0 else 0
+        slower = change > threshold
+        print(f"[{'slower' if slower else 'ok'}] {name}: {before:.4f}s -> {after:.4f}s ({change:+.1%})")
+        if slower:
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == '__main__':
+    prs = argparse.ArgumentParser(description='Benchmark Module - Times the hot paths of plotme on synthetic data.')
+    prs.add_argument('-r', '--rows', type=int, default=100000, help='Number of rows of each file.')
+    prs.add_argument('-c', '--columns', type=int, default=4, help='Number of y columns of each file.')
+    prs.add_argument('-n', '--files', type=int, default=4, help='Number of files.')
+    prs.add_argument('-sep', '--separator', type=str, default=',', help='Separator of the columns of the files.')
+    prs.add_argument('-s', '--seed', type=int, default=0, help='Seed of the random data.')
+    prs.add_argument('-rp', '--repeat', type=int, default=5, help='Number of runs of each benchmark.')
+    prs.add_argument('-w', '--window', type=int, default=50, help='Window of the moving average benchmark.')
+    prs.add_argument('-fmt', '--formats', nargs='+', type=str, default=['png', 'pdf', 'svg'],
+                     help='Formats of the exportFile benchmarks.')
+    prs.add_argument('-b', '--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS,
+                     help='Benchmarks to run.')
+    prs.add_argument('-d', '--directory', type=str, default=None,
+                     help='Directory where the data is generated. By default a temporary one is used and removed.')
+    prs.add_argument('-o', '--output', type=str, default=None, help='JSON file where the results are saved.')
+    prs.add_argument('-bl', '--baseline', type=str, default=None,
+                     help='JSON file of a previous run. The results are compared with it and the script fails if a '
+                          'benchmark got slower than the threshold.')
+    prs.add_argument('-t', '--threshold', type=float, default=0.2,
+                     help='Fraction of the baseline time a benchmark may get slower before it is a regression.')
+    args = prs.parse_args()
+
+    config = {key: getattr(args, key) for key in ('rows', 'columns', 'files', 'separator', 'seed', 'repeat', 'window')}
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.directory or tmp
+        os.makedirs(directory, exist_ok=True)
+        files = generate_dataset(directory, args.rows, args.columns, args.files, args.separator, args.seed)
+        results = {name: summarize(times) for name, times in run_benchmarks(files, args).items()}
+
+    import matplotlib
+    report = {
+        'config': config,
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'matplotlib': matplotlib.__version__
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+
+    failed = False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        # the number of runs doesn't change the data that is measured
+        same = {key: value for key, value in baseline.get('config', {}).items() if key != 'repeat'}
+        if same != {key: value for key, value in config.items() if key != 'repeat'}:
+            print('The baseline was run with a different configuration, so the times may not be comparable')
+        regressions = compare(results, baseline['results'], args.threshold)
+        failed = bool(regressions)
+        print(f'{len(regressions)} benchmarks got slower than {args.threshold:.0%}')
+
+    sys.exit(1 if failed else 0)
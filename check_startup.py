@@ -0,0 +1,73 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# seconds, measured as the best of several runs in new interpreters
+BUDGETS = {
+    'import': 0.5,
+    'auc': 0.75,
+}
+
+# modules that must not be loaded by each path
+FORBIDDEN = {
+    'import': ['matplotlib', 'seaborn', 'scipy'],
+    'auc': ['matplotlib', 'seaborn'],
+}
+
+IMPORT_CODE = '''
+import json, sys, time
+start = time.perf_counter()
+import plotme
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(m for m in sys.modules if '.' not in m)}))
+'''
+
+AUC_CODE = '''
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+import plotme
+with contextlib.redirect_stdout(io.StringIO()):
+    plotme.main(['-f', sys.argv[1], '-y', '2', '-auc'])
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'modules': sorted(m for m in sys.modules if '.' not in m)}))
+'''
+
+
+def measure(code, runs, *args):
+    """Runs the code in new interpreters and returns the fastest run"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYTHONPATH=here + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-W', 'ignore', '-c', code, *args], env=env, capture_output=True,
+                             text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(results, key=lambda result: result['seconds'])
+
+
+if __name__ == '__main__':
+    prs = argparse.ArgumentParser(description='Startup Check - Fails if plotme takes longer than its budgets to start.')
+    prs.add_argument('-r', '--runs', type=int, default=5, help='Number of runs of each measurement.')
+    args = prs.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data = os.path.join(tmp, 'data.csv')
+        with open(data, 'w') as f:
+            f.write('x,y\n' + ''.join(f'{i},{i * i}\n' for i in range(100)))
+        results = {
+            'import': measure(IMPORT_CODE, args.runs),
+            'auc': measure(AUC_CODE, args.runs, data),
+        }
+
+    failed = False
+    for name, result in results.items():
+        loaded = [module for module in FORBIDDEN[name] if module in result['modules']]
+        ok = result['seconds'] <= BUDGETS[name] and not loaded
+        failed = failed or not ok
+        print(f"[{'ok' if ok else 'failed'}] {name}: {result['seconds']:.3f}s (budget {BUDGETS[name]}s)"
+              + (f", loaded {', '.join(loaded)}" if loaded else ''))
+
+    sys.exit(1 if failed else 0)
@@ -1,28 +1,73 @@
 import sys
 import numbers
 
-import matplotlib
-import matplotlib.pyplot as plt
-import seaborn as sns
-from matplotlib.colors import ListedColormap, to_hex
-
-try:
-    from matplotlib.colors import TwoSlopeNorm as nrm
-except:
-    from matplotlib.colors import DivergingNorm as nrm
-
 import argparse
 
 import os
 
+import io
 import re
 import ast
+import mmap
+import json
+import hashlib
+import time
+import pickle
+import tempfile
+import contextlib
+import warnings
 
 import pandas as pd
 import numpy as np
 import itertools
 
-from scipy.integrate import simps, trapz
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# matplotlib, seaborn and scipy are only imported by the code that needs them, so runs that don't plot (like -auc) and
+# scripts that import plotme don't pay for them
+
+# percentiles of the areas under the curves reported across the files
+AUC_PERCENTILES = (5, 25, 50, 75, 95)
+# percentiles of the stats mode, the same ones of pandas describe
+STATS_PERCENTILES = (25, 50, 75)
+# the stages of a plot aren't measured unless profiling
+NO_PROFILE = contextlib.nullcontext()
+# the options that change how a plot looks, which are part of the fingerprint of incremental plots
+RENDER_OPTIONS = ('graphType', 'output', 'sep', 'comment', 'header', 'extension', 'columnTypes', 'x', 'y', 'Palette',
+                  'symbols', 'distBetSymbols', 'symbolSize', 'figSize', 'fontSize', 'lineWidth', 'plotTitle', 'xLabel',
+                  'yLabel', 'pieLabel', 'xmax', 'xmin', 'ymax', 'ymin', 'label', 'bgColor', 'gColor', 'colors',
+                  'hideSpine', 'w', 'windowType', 'sd', 'stream', 'chunkSize', 'downsample', 'downsampleMethod',
+                  'density', 'densityLog', 'densityColormap', 'align', 'band', 'bandPercentiles',
+                  'bootstrapSamples', 'dtype')
+# the fingerprint of an incremental plot is kept in a file with the name of the plot followed by this
+FINGERPRINT = '.fingerprint'
+# percentiles of the shadows of the quantile band (around the median) and of the bootstrap band (around the mean)
+QUANTILE_BAND = (25, 75)
+BOOTSTRAP_BAND = (2.5, 97.5)
+# values of all the files read back at a time by a streamed quantile band, which bounds its memory
+QUANTILE_BLOCK = 10 ** 6
+# values of the bootstrap means calculated at a time, which bounds the memory of the bootstrap band
+BOOTSTRAP_BLOCK = 10 ** 7
+# rows parsed at a time when a file is parsed into compact types
+COMPACT_CHUNK = 500000
+# the compressed formats pandas can decompress while parsing, by their extensions
+COMPRESSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'xz', '.zst': 'zstd'}
+# rows of each file parsed by the pre-flight checks (and of the first file of the streamed areas and stats, to check its
+# columns), and bytes whose lines are counted at a time
+PREFLIGHT_ROWS = 100
+PREFLIGHT_BLOCK = 1 << 24
+
+
+def load_pyplot(display=False):
+    """
+    Imports pyplot. Unless the plot is going to be displayed, the non-interactive Agg backend is chosen (if no backend
+    was set with MPLBACKEND and pyplot wasn't imported by someone else yet), so matplotlib doesn't look for a GUI
+    """
+    import matplotlib
+    if not display and 'MPLBACKEND' not in os.environ and 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
 
 
 def rename_file_if_conflict(filename, output_contains_name=False):
@@ -32,14 +77,7 @@ def rename_file_if_conflict(filename, output_contains_name=False):
     """
     if output_contains_name:
         if os.path.exists(filename):
-            action = input('This filename already exists. Would you like to replace the existing file? (yes/no) ')
-            action = action.lower()
-            while (action != 'yes') and (action != 'no'):
-                print('Invalid command!')
-                action = input('This filename already exists. Would you like to replace the existing file? (yes/no) ')
-                action = action.lower()
-            
-            if action == 'no':
+            if not ask_to_replace(filename):
                 sys.exit()
     else:
         i = 1
@@ -54,6 +92,887 @@ def rename_file_if_conflict(filename, output_contains_name=False):
     return filename
 
 
+def ask_to_replace(filename):
+    """Asks if an existing file can be replaced, until the answer is yes or no"""
+    action = input('This filename already exists. Would you like to replace the existing file? (yes/no) ')
+    action = action.lower()
+    while (action != 'yes') and (action != 'no'):
+        print('Invalid command!')
+        action = input('This filename already exists. Would you like to replace the existing file? (yes/no) ')
+        action = action.lower()
+    return action == 'yes'
+
+
+def save_figure(fig, filename):
+    fig.savefig(filename, bbox_inches="tight", facecolor=fig.get_facecolor(), transparent=True)
+
+
+def save_pickled_figure(figure, filename):
+    """
+    Saves a figure that was pickled by another process. It is kept at module level so it can be sent to the workers of
+    a process pool, each of them drawing its own copy of the figure
+    """
+    plt = load_pyplot()
+    fig = pickle.loads(figure)
+    save_figure(fig, filename)
+    plt.close(fig)
+    return filename
+
+
+def resolve_separator(sep):
+    """
+    Returns the separator and the pandas engine that should parse it. The C parser is used whenever the separator is a
+    single character (escaped or not) or whitespace, and the python parser is only kept for regular expressions
+    """
+    # a space separator used to be escaped to be accepted by the python engine
+    if sep == '' or sep == ' ':
+        return ' ', 'c'
+    if sep == '\\s+' or len(sep) == 1:
+        return sep, 'c'
+    # escaped characters, such as '\t' or '\|', are just a single character
+    if len(sep) == 2 and sep[0] == '\\':
+        if sep[1] == 't':
+            return '\t', 'c'
+        if not sep[1].isalnum():
+            return sep[1], 'c'
+    return sep, 'python'
+
+
+def detect_compression(fname):
+    """
+    Compression of a file, by its extension or, if it doesn't have one of them, by its first bytes. None if the file
+    isn't compressed
+    """
+    extension = os.path.splitext(fname)[1].lower()
+    if extension in COMPRESSIONS:
+        return COMPRESSIONS[extension]
+    try:
+        with open(fname, 'rb') as f:
+            start = f.read(10)
+    except OSError:
+        return None
+    if start.startswith(b'\x1f\x8b'):
+        return 'gzip'
+    # bz2 has the block size and the magic number of the first block after its name, which a text file won't have
+    if start.startswith(b'BZh') and start[3:4].isdigit() and start[4:10] == b'1AY&SY':
+        return 'bz2'
+    if start.startswith(b'\xfd7zXZ\x00'):
+        return 'xz'
+    if start.startswith(b'\x28\xb5\x2f\xfd'):
+        return 'zstd'
+    return None
+
+
+def has_extension(fname, extension):
+    """Tells if the file has the extension, or the extension followed by the one of a compressed format"""
+    name, compressed = os.path.splitext(fname)
+    if compressed.lower() in COMPRESSIONS:
+        fname = name
+    return fname.endswith(extension)
+
+
+def read_table(fname, **kwargs):
+    """
+    pd.read_csv of a file that may be compressed, which is decompressed while it is parsed instead of being extracted
+    first. gzip files are decompressed by another thread with isal, if it is installed, so decompressing and parsing
+    run at the same time
+    """
+    compression = detect_compression(fname)
+    if compression == 'gzip':
+        try:
+            from isal import igzip_threaded
+        except ImportError:
+            igzip_threaded = None
+        if igzip_threaded is not None:
+            handle = igzip_threaded.open(fname, 'rb', threads=1)
+            if kwargs.get('chunksize'):
+                return read_chunks(pd.read_csv(handle, **kwargs), handle)
+            with handle:
+                return pd.read_csv(handle, **kwargs)
+    return pd.read_csv(fname, compression=compression, **kwargs)
+
+
+def read_chunks(reader, handle):
+    """Yields the chunks of a reader, closing the file it reads when they end"""
+    with handle, reader:
+        yield from reader
+
+
+def count_rows(fname, header=True, comment='#'):
+    """
+    Number of lines of data of a file, found by counting its lines through mmap instead of parsing them. The blank
+    lines and the lines that start with the comment are skipped, as pandas does, but quoted newlines, lines of spaces
+    and line endings without a newline aren't parsed the same way, so the count may differ from the rows pandas parses
+    """
+    with open(fname, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lines = 0 if mm[-1:] == b'\n' else 1
+            # the first line doesn't come after a newline
+            skipped = int(mm[:1] == b'\n' or mm[:2] == b'\r\n' or bool(comment) and mm[:1] == comment[0].encode())
+            for position in range(0, len(mm), PREFLIGHT_BLOCK):
+                # the block goes two bytes into the next one, so the newlines at its end see the lines they start
+                block = mm[position:position + PREFLIGHT_BLOCK + 2]
+                lines += block.count(b'\n', 0, PREFLIGHT_BLOCK)
+                # looking for a single byte is much faster than for a pair, so the pairs are only looked for when the
+                # comment or a carriage return are in the block
+                if b'\n\n' in block or b'\r' in block or bool(comment) and comment[0].encode() in block:
+                    skipped += count_skipped(block, comment)
+    lines -= skipped
+    return max(lines - 1, 0) if header else lines
+
+
+def count_skipped(block, comment):
+    """
+    Number of newlines among the first PREFLIGHT_BLOCK bytes of the block that start a blank or a comment line. The
+    skipped lines may follow each other, so every newline is compared with the bytes after it, as bytes.count doesn't
+    overlap the pairs it counts
+    """
+    values = np.frombuffer(block.ljust(PREFLIGHT_BLOCK + 2, b'\0'), np.uint8)
+    after = values[1:-1]
+    skips = (after == ord('\n')) | ((after == ord('\r')) & (values[2:] == ord('\n')))
+    if comment:
+        skips |= after == ord(comment[0])
+    return np.count_nonzero((values[:-2] == ord('\n')) & skips)
+
+
+def lttb(x, y, n):
+    """
+    Largest-Triangle-Three-Buckets: returns the indexes of n points of the line (x, y) that keep its visual shape. The
+    first and last points are always kept, and from every other bucket the point that forms the largest triangle with
+    the point chosen in the previous bucket and the average of the next bucket is selected
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # NaN values can't be drawn, so they are left out of the buckets
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    size = len(valid)
+    if n >= size or n < 3:
+        return valid
+    x, y = x[valid], y[valid]
+
+    # n - 2 buckets between the first and the last points, and the average of each one of them
+    edges = np.linspace(1, size - 1, n - 1).astype(int)
+    sumX = np.concatenate(([0], np.cumsum(x)))
+    sumY = np.concatenate(([0], np.cumsum(y)))
+    counts = edges[1:] - edges[:-1]
+    avgX = np.append((sumX[edges[1:]] - sumX[edges[:-1]]) / counts, x[-1])
+    avgY = np.append((sumY[edges[1:]] - sumY[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(n, dtype=int)
+    selected[0], selected[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        # double of the area of the triangles, for every point of the bucket at once
+        area = np.abs((x[a] - avgX[i + 1]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avgY[i + 1] - y[a]))
+        a = start + np.argmax(area)
+        selected[i + 1] = a
+
+    return valid[selected]
+
+
+def minmax(y, n):
+    """
+    Min/max envelope: splits the line in n/2 buckets and returns the indexes of the lowest and the highest points of
+    each one of them, besides the first and the last points
+    """
+    y = np.asarray(y, dtype=np.float64)
+    size = len(y)
+    buckets = n // 2
+    if n >= size or buckets < 1:
+        return np.arange(size)
+
+    # the buckets are padded to the same length, so the minimums and maximums are found in a single call
+    edges = np.linspace(0, size, buckets + 1).astype(int)
+    positions = edges[:-1, None] + np.arange(np.diff(edges).max())
+    inside = positions < edges[1:, None]
+    positions = np.minimum(positions, size - 1)
+    values = y[positions]
+    valid = inside & ~np.isnan(values)
+    lowest = np.argmin(np.where(valid, values, np.inf), axis=1)
+    highest = np.argmax(np.where(valid, values, -np.inf), axis=1)
+
+    rows = np.arange(buckets)
+    return np.unique(np.concatenate(([0, size - 1], positions[rows, lowest], positions[rows, highest])))
+
+
+def envelope(x, lower, upper, n):
+    """
+    Reduces a band to n/2 buckets, keeping the lowest bottom and the highest top of each one, so a shadow drawn with the
+    result covers the whole original band
+    """
+    x = np.asarray(x, dtype=np.float64)
+    size = len(x)
+    buckets = n // 2
+    if n >= size or buckets < 1:
+        return x, np.asarray(lower), np.asarray(upper)
+
+    edges = np.linspace(0, size, buckets + 1).astype(int)
+    lower = np.fmin.reduceat(np.asarray(lower, dtype=np.float64), edges[:-1])
+    upper = np.fmax.reduceat(np.asarray(upper, dtype=np.float64), edges[:-1])
+    # every bucket spans from its first to its last x
+    xs = np.column_stack((x[edges[:-1]], x[edges[1:] - 1])).ravel()
+    return xs, np.repeat(lower, 2), np.repeat(upper, 2)
+
+
+def align_runs(xs, ys, how='union'):
+    """
+    Resamples runs with different x values onto a common grid, by linear interpolation, and returns the grid and an
+    array with the values of every run (runs, grid, columns). The grid has every x of every run (union) or only the ones
+    inside the range all the runs cover (intersection), and runs are NaN outside of their own range.
+
+    All the runs are interpolated at once: each x is replaced by its rank in the grid, and the ranks of each run are
+    shifted past the ones of the run before it, so a single searchsorted over all the runs finds the neighbours of
+    every point of the grid in every run, without the rounding a shift of the x values themselves would have
+    """
+    lengths = np.array([len(x) for x in xs])
+    run = np.repeat(np.arange(len(xs)), lengths)
+    x = np.concatenate([np.asarray(x, dtype=np.float64) for x in xs])
+    y = np.concatenate([np.asarray(y, dtype=np.float64).reshape(len(x), -1) for x, y in zip(xs, ys)])
+
+    # rows without an x can't be placed in the grid, and each run is sorted by its x
+    valid = ~np.isnan(x)
+    run, x, y = run[valid], x[valid], y[valid]
+    order = np.lexsort((x, run))
+    run, x, y = run[order], x[order], y[order]
+
+    union = np.unique(x)
+    if not len(union):
+        return union, np.full((len(xs), 0, y.shape[1]), np.nan)
+    grid = union
+    if how == 'intersection':
+        present = np.unique(run)
+        if len(present) < len(xs):
+            grid = union[:0]
+        else:
+            first = np.searchsorted(run, present)
+            last = np.searchsorted(run, present, side='right') - 1
+            grid = union[(union >= x[first].max()) & (union <= x[last].min())]
+
+    keys = run * len(union) + np.searchsorted(union, x)
+    queries = (np.arange(len(xs))[:, None] * len(union) + np.searchsorted(union, grid)).ravel()
+    queryRuns = np.repeat(np.arange(len(xs)), len(grid))
+    # the last point at or before each point of the grid, and the one after it unless it is at the point itself
+    left = np.searchsorted(keys, queries, side='right') - 1
+    inside = left >= 0
+    left = np.maximum(left, 0)
+    right = left + (keys[left] != queries)
+    inside &= right < len(keys)
+    right = np.minimum(right, len(keys) - 1)
+    inside &= (run[left] == queryRuns) & (run[right] == queryRuns)
+
+    width = x[right] - x[left]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fraction = np.where(width > 0, (np.tile(grid, len(xs)) - x[left]) / width, 0)
+    # the points outside of a run get a NaN fraction, which makes their values NaN
+    fraction[~inside] = np.nan
+    values = y[left] + fraction[:, None] * (y[right] - y[left])
+    return grid, values.reshape(len(xs), len(grid), y.shape[1])
+
+
+def nan_quantiles(values, qs):
+    """
+    Quantiles (between 0 and 1) along the first axis, ignoring NaN values and interpolating linearly like numpy does.
+    It sorts the whole array once, instead of the element by element loop of nanpercentile
+    """
+    values = np.sort(values, axis=0)
+    count = (~np.isnan(values)).sum(axis=0)
+    result = np.empty((len(qs),) + values.shape[1:])
+    for i, q in enumerate(qs):
+        position = q * np.maximum(count - 1, 0)
+        below = np.floor(position).astype(int)
+        above = np.minimum(below + 1, np.maximum(count - 1, 0))
+        low = np.take_along_axis(values, below[None], axis=0)[0]
+        high = np.take_along_axis(values, above[None], axis=0)[0]
+        result[i] = np.where(count > 0, low + (position - below) * (high - low), np.nan)
+    return result
+
+
+def bootstrap_counts(runs, samples, seed=0):
+    """
+    How many times each run is drawn in each resample. The seed is fixed, so the same files always give the same
+    shadow
+    """
+    rng = np.random.default_rng(seed)
+    return rng.multinomial(runs, np.full(runs, 1 / runs), size=samples).astype(np.float64)
+
+
+def bootstrap_means(values, counts):
+    """
+    Means of every resample of the runs (the first axis of values), ignoring NaN values. Each resample is a row of
+    counts, so the sums of all the resamples are a single matrix product of the counts by the runs
+    """
+    flat = values.reshape(len(values), -1)
+    valid = ~np.isnan(flat)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (counts @ np.where(valid, flat, 0)) / (counts @ valid)
+
+
+def bootstrap_interval(values, percentiles, samples=1000, seed=0):
+    """
+    Bootstrap confidence interval of the mean of the runs (the first axis of values) at every other position. The
+    resamples are calculated for a block of positions at a time, so the memory doesn't grow with the length of the runs
+    """
+    counts = bootstrap_counts(len(values), samples, seed)
+    flat = values.reshape(len(values), -1)
+    interval = np.empty((2, flat.shape[1]))
+    step = max(1, BOOTSTRAP_BLOCK // samples)
+    for start in range(0, flat.shape[1], step):
+        means = bootstrap_means(flat[:, start:start + step], counts)
+        interval[:, start:start + step] = nan_quantiles(means, [p / 100 for p in percentiles])
+    return interval.reshape((2,) + values.shape[1:])
+
+
+class FileCache:
+    """
+    Keeps the parsed files in a directory, one uncompressed .npz archive per file, so a file that didn't change since
+    the last run is loaded without being parsed again. The least recently used entries are removed once the directory
+    grows bigger than maxSize megabytes
+    """
+    def __init__(self, directory, maxSize=1024):
+        self.directory = directory
+        self.maxSize = maxSize * 1024 * 1024
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, fname, args, dtype=None):
+        """The entry of a file depends on its path, size, modification time and on how it is parsed"""
+        info = os.stat(fname)
+        description = [os.path.abspath(fname), info.st_size, info.st_mtime_ns, args, dtype]
+        description = json.dumps(description, sort_keys=True, default=str)
+        return hashlib.sha1(description.encode()).hexdigest()
+
+    def has(self, key):
+        return os.path.exists(os.path.join(self.directory, key + '.npz'))
+
+    def load(self, key):
+        path = os.path.join(self.directory, key + '.npz')
+        try:
+            with np.load(path, allow_pickle=False) as archive:
+                names = json.loads(str(archive['names']))
+                kinds = json.loads(str(archive['kinds']))
+                columns = {}
+                for i, kind in enumerate(kinds):
+                    columns[i] = archive[f'c{i}']
+                    if kind is not None:
+                        # the codes of the text and categorical columns are -1 where they are empty
+                        columns[i] = pd.Categorical.from_codes(columns[i], archive[f'k{i}'], ordered=kind == 'ordered')
+                        if kind == 'object':
+                            columns[i] = columns[i].astype(object)
+        except (OSError, ValueError, KeyError):
+            # missing or incomplete entry, the file is parsed again
+            return None
+
+        # marks the entry as recently used
+        os.utime(path)
+        df = pd.DataFrame(columns, copy=False)
+        df.columns = names
+        return df
+
+    def store(self, key, df):
+        path = os.path.join(self.directory, key + '.npz')
+        arrays, kinds = {}, []
+        for i in range(len(df.columns)):
+            values = df.iloc[:, i]
+            if values.dtype == object or isinstance(values.dtype, pd.CategoricalDtype):
+                # objects would have to be pickled, so the text and categorical columns are kept as the codes of their
+                # categories, and the files with other objects are always parsed
+                if values.dtype == object:
+                    codes, categories = pd.factorize(values)
+                    kinds.append('object')
+                else:
+                    codes, categories = values.cat.codes.to_numpy(), values.cat.categories
+                    kinds.append('ordered' if values.cat.ordered else 'category')
+                categories = np.asarray(categories)
+                if categories.dtype == object:
+                    if not all(isinstance(category, str) for category in categories):
+                        return
+                    categories = categories.astype(str)
+                arrays[f'c{i}'], arrays[f'k{i}'] = codes, categories
+            else:
+                arrays[f'c{i}'] = values.to_numpy()
+                kinds.append(None)
+        arrays['names'] = np.array(json.dumps(df.columns.tolist()))
+        arrays['kinds'] = np.array(json.dumps(kinds))
+        # writes to a temporary file first, so other processes never load a half written entry
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                try:
+                    info = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((info.st_mtime, info.st_size, name))
+
+        # removes the least recently used entries until the cache fits the maximum size
+        entries.sort()
+        size = sum(entry[1] for entry in entries)
+        for _, entrySize, name in entries:
+            if size <= self.maxSize:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            size -= entrySize
+
+
+class RunningStats:
+    """
+    Running count, mean and sum of squared differences (M2) of several series, computed element by element with
+    Welford's algorithm, so the files can be added one at a time. NaN values are ignored, like pandas does
+    """
+    def __init__(self, shape):
+        self.count = np.zeros(shape)
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, values, rows=slice(None)):
+        """Adds one new sample to every element of the given rows"""
+        valid = ~np.isnan(values)
+        values = np.where(valid, values, 0)
+        count = self.count[rows] + valid
+        delta = np.where(valid, values - self.mean[rows], 0)
+        mean = self.mean[rows] + delta / np.maximum(count, 1)
+        self.m2[rows] += delta * (values - mean) * valid
+        self.mean[rows] = mean
+        self.count[rows] = count
+
+    def getMean(self):
+        return np.where(self.count > 0, self.mean, np.nan)
+
+    def getStd(self):
+        """Sample standard deviation, the same as pandas std"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of several columns in bounded memory, with a KLL-like sketch whose items are rows (one value
+    per column). Every level keeps items of weight 2**level. When a level gets too big, each column is sorted and every
+    other item (starting at random) goes up one level. Sketches of different files can be merged, so the files can be
+    read in parallel
+    """
+    def __init__(self, columns, k=1000, seed=None):
+        self.k = k
+        self.columns = columns
+        self.levels = [np.empty((0, columns))]
+        self.rng = np.random.default_rng(seed)
+
+    def capacity(self, level):
+        # the lower levels are smaller, as their items weigh less
+        return max(int(self.k * (2 / 3) ** (len(self.levels) - level - 1)), 2)
+
+    def update(self, values):
+        """Adds the rows of a 2D array"""
+        self.levels[0] = np.concatenate((self.levels[0], np.asarray(values, dtype=np.float64).reshape(-1, self.columns)))
+        self.compress()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty((0, self.columns)))
+            self.levels[level] = np.concatenate((self.levels[level], items))
+        self.compress()
+        return self
+
+    def compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty((0, self.columns)))
+                # NaN values are sorted to the end of the columns, so they are kept out of the other values' ranks
+                items = np.sort(items, axis=0)
+                # an odd item stays in this level
+                even = len(items) - len(items) % 2
+                promoted = items[self.rng.integers(2):even:2]
+                self.levels[level] = items[even:]
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+            level += 1
+
+    def quantiles(self, qs):
+        """Returns an array of quantiles (between 0 and 1) x columns"""
+        values = np.concatenate(self.levels)
+        result = np.full((len(qs), self.columns), np.nan)
+        if len(values) == 0:
+            return result
+
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.levels)])
+        order = np.argsort(values, axis=0)
+        values = np.take_along_axis(values, order, axis=0)
+        weights = np.where(np.isnan(values), 0, weights[order])
+        ranks = np.cumsum(weights, axis=0)
+        total = ranks[-1]
+        columns = np.arange(self.columns)
+        for i, q in enumerate(qs):
+            # the first item whose rank reaches the quantile
+            positions = (ranks >= q * total).argmax(axis=0)
+            result[i] = np.where(total > 0, values[positions, columns], np.nan)
+        return result
+
+
+class ColumnStats:
+    """
+    Count, mean, standard deviation, minimum, maximum and approximate quantiles of several columns, updated one chunk of
+    rows at a time and mergeable with the ones of other files (Chan's parallel version of Welford's algorithm). NaN
+    values are ignored, like pandas does
+    """
+    def __init__(self, columns, k=1000):
+        self.count = np.zeros(columns)
+        self.mean = np.zeros(columns)
+        self.m2 = np.zeros(columns)
+        self.min = np.full(columns, np.inf)
+        self.max = np.full(columns, -np.inf)
+        self.sketch = QuantileSketch(columns, k)
+
+    def update(self, values):
+        """Adds the rows of a 2D array"""
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        count = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / np.maximum(count, 1), 0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        self._combine(count, mean, m2, np.nanmin(np.where(valid, values, np.inf), axis=0, initial=np.inf),
+                      np.nanmax(np.where(valid, values, -np.inf), axis=0, initial=-np.inf))
+        self.sketch.update(values)
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def _combine(self, count, mean, m2, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.mean = np.where(total > 0, self.mean + delta * count / np.maximum(total, 1), 0)
+            self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / np.maximum(total, 1)
+        self.count = total
+        self.min = np.minimum(self.min, minimum)
+        self.max = np.maximum(self.max, maximum)
+
+    def describe(self, columns=None, quantiles=(0.25, 0.5, 0.75)):
+        """The statistics as a DataFrame in the layout of pandas describe, with one column for each column"""
+        empty = self.count == 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+        rows = {
+            'count': self.count,
+            'mean': np.where(empty, np.nan, self.mean),
+            'std': std,
+            'min': np.where(empty, np.nan, self.min)
+        }
+        for q, values in zip(quantiles, self.sketch.quantiles(quantiles)):
+            rows[f'{q * 100:g}%'] = values
+        rows['max'] = np.where(empty, np.nan, self.max)
+        return pd.DataFrame(rows, index=columns).T
+
+
+def describe_file(fname, args, chunkSize, columns, k=1000):
+    """
+    Statistics of some columns of a file that is read in chunks of rows. It is kept at module level so it can be sent to
+    the workers of a process pool
+    """
+    stats = ColumnStats(len(columns), k)
+    for chunk in read_table(fname, chunksize=chunkSize, **args):
+        stats.update(chunk.iloc[:, columns].to_numpy(dtype=np.float64))
+    return stats
+
+
+class Profiler:
+    """
+    Measures the wall time, the CPU time, the growth of the peak RSS and the peak of the memory allocated by Python
+    (tracemalloc, above what was allocated when the stage started) during each stage of a plot. The peak RSS of the
+    process since it started is kept as well, which is the same for every stage after the biggest one. Only the main
+    process is measured, so the work done by the workers of a process pool counts as wall time only. If a dump file is
+    given, every stage also runs under cProfile and the statistics of the slowest one are saved
+    """
+    def __init__(self, dump=None):
+        import tracemalloc
+        self.tracemalloc = tracemalloc
+        self.stages = []
+        self.dump = dump
+        self.slowest = None
+        # tracemalloc slows every allocation down, so it is only stopped by the profiler that started it
+        self.started = not tracemalloc.is_tracing()
+        if self.started:
+            tracemalloc.start()
+
+    def stop(self):
+        """Stops tracing the allocations, if this profiler is the one that started it"""
+        if self.started and self.tracemalloc.is_tracing():
+            self.tracemalloc.stop()
+        self.started = False
+
+    @staticmethod
+    def peakRss():
+        """Peak resident set size of the process in megabytes, or None where it can't be read"""
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # linux reports kilobytes and macOS reports bytes
+        return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        self.tracemalloc.reset_peak()
+        allocated = self.tracemalloc.get_traced_memory()[0]
+        rss = self.peakRss()
+        profile = None
+        if self.dump:
+            import cProfile
+            profile = cProfile.Profile()
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profile:
+            profile.enable()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            # the plot won't reach the report, so the tracing is stopped once the stage is measured
+            failed = True
+            raise
+        finally:
+            if profile:
+                profile.disable()
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            self.stages.append({
+                'stage': name,
+                'wall': wall,
+                'cpu': cpu,
+                # the peak RSS can only be read for the whole life of the process, so a stage is measured by how
+                # much it raised that peak
+                'peakRssGrowth': self.peakRss() - rss if rss is not None else None,
+                'processPeakRss': self.peakRss(),
+                'peakTracemalloc': (self.tracemalloc.get_traced_memory()[1] - allocated) / 1024 ** 2
+            })
+            if profile and (self.slowest is None or wall > self.slowest[0]):
+                self.slowest = (wall, name, profile)
+            if failed:
+                self.stop()
+
+    def report(self, output=None):
+        """
+        Saves the stages as JSON if a file name is given, otherwise prints them to stderr. Nothing else is measured
+        after the report, so the tracing of the allocations is stopped
+        """
+        self.stop()
+        if self.slowest:
+            self.slowest[2].dump_stats(self.dump)
+
+        if output:
+            with open(output, 'w') as f:
+                json.dump({'stages': self.stages, 'cProfile': {'stage': self.slowest[1], 'file': self.dump}
+                           if self.slowest else None}, f, indent=4)
+            return
+
+        print(f'{"stage":<22}{"wall (s)":>10}{"cpu (s)":>10}{"rss growth (MB)":>17}{"tracemalloc (MB)":>18}'
+              f'{"process peak rss (MB)":>23}', file=sys.stderr)
+        for stage in self.stages:
+            growth, peak = [f'{stage[key]:.1f}' if stage[key] is not None else '-'
+                            for key in ('peakRssGrowth', 'processPeakRss')]
+            print(f'{stage["stage"]:<22}{stage["wall"]:>10.4f}{stage["cpu"]:>10.4f}{growth:>17}'
+                  f'{stage["peakTracemalloc"]:>18.1f}{peak:>23}', file=sys.stderr)
+        print(f'{"total":<22}{sum(stage["wall"] for stage in self.stages):>10.4f}'
+              f'{sum(stage["cpu"] for stage in self.stages):>10.4f}', file=sys.stderr)
+        if self.slowest:
+            print(f'cProfile of {self.slowest[1]} saved in {self.dump}', file=sys.stderr)
+
+
+def read_data_file(fname, args, cache=None, dtype=None, floats=()):
+    """
+    Parses a single data file, or loads it from the cache if one is given. With a dtype, the file is parsed into compact
+    types (see compact_types), and floats are the positions of the columns that may become float32. It is kept at
+    module level so it can be sent to the workers of a process pool
+    """
+    if cache is None:
+        return read_compact(fname, args, dtype, floats) if dtype else read_table(fname, **args)
+
+    key = cache.key(fname, args, dtype)
+    df = cache.load(key)
+    if df is None:
+        df = read_compact(fname, args, dtype, floats) if dtype else read_table(fname, **args)
+        cache.store(key, df)
+    return df
+
+
+def read_compact(fname, args, dtype, floats):
+    """
+    Parses a file in chunks of rows, each of them converted to compact types before the next one is parsed, so the 64
+    bit columns of the whole file never exist at the same time. Giving the types to read_csv itself makes it slower and
+    use more memory than parsing 64 bit numbers
+    """
+    chunks = [compact_types(chunk, dtype, floats) for chunk in read_table(fname, chunksize=COMPACT_CHUNK, **args)]
+    if len(chunks) == 1:
+        return chunks[0]
+    # chunks whose integers were downcast to different types are joined in the widest of them
+    return pd.concat(chunks, ignore_index=True)
+
+
+def compact_types(df, dtype, floats):
+    """
+    Converts the numeric columns among floats (their positions) to float32: all of them with the float32 dtype, and only
+    the ones with decimals with the auto dtype, which also converts the integer columns to the smallest integer type
+    that holds them
+    """
+    for i in range(len(df.columns)):
+        values = df.iloc[:, i]
+        if i in floats and (pd.api.types.is_float_dtype(values)
+                            or (dtype == 'float32' and pd.api.types.is_numeric_dtype(values))):
+            df.isetitem(i, values.astype(np.float32))
+        elif dtype == 'auto' and pd.api.types.is_integer_dtype(values):
+            df.isetitem(i, pd.to_numeric(values, downcast='integer'))
+    return df
+
+
+class Buffer:
+    """
+    Rows of numbers that keep being appended to. The array has spare room that doubles when it runs out, so appending
+    costs the size of the new rows instead of copying the old ones
+    """
+    def __init__(self, columns, capacity=1024):
+        self.array = np.empty((capacity, columns))
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def write(self, start, rows):
+        """Writes the rows from the start row on, replacing the ones that were there and appending the others"""
+        end = start + len(rows)
+        if end > len(self.array):
+            array = np.empty((max(end, 2 * len(self.array)), self.array.shape[1]))
+            array[:self.size] = self.array[:self.size]
+            self.array = array
+        self.array[start:end] = rows
+        self.size = max(self.size, end)
+
+    def append(self, rows):
+        self.write(self.size, rows)
+
+    def view(self):
+        return self.array[:self.size]
+
+
+class FileTail:
+    """
+    Reads a file that keeps growing, such as the log of a running simulation. Each read starts where the last one
+    stopped and only returns complete lines, so a line that is still being written is left for the next read
+    """
+    def __init__(self, fname, header=True, comment='#'):
+        self.fname = fname
+        self.offset = 0
+        # the header is kept to be parsed with every new block of lines
+        self.header = b'' if header else None
+        self.comment = comment.encode() if comment else None
+
+    def read(self):
+        """Returns the complete lines appended since the last read"""
+        with open(self.fname, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        data = data[:end]
+        self.offset += end
+
+        # the header is the first line that isn't a comment or blank
+        if self.header == b'':
+            start = 0
+            for line in data.splitlines(keepends=True):
+                start += len(line)
+                if line.strip() and not (self.comment and line.startswith(self.comment)):
+                    self.header, data = data[:start], data[start:]
+                    break
+            else:
+                # only comments and blank lines so far
+                data = b''
+        return data
+
+    def parse(self, args):
+        """
+        Parses the lines appended since the last read, with the arguments of read_csv. Returns None if there are no new
+        lines, besides in the first read of a file with a header, which has its columns. A file that is still empty (or
+        only has comments) has nothing to parse, so it also returns None and the file is read again on the next poll
+        """
+        first = self.offset == 0
+        data = self.read()
+        if not data and not (first and self.header):
+            return None
+        return pd.read_csv(io.BytesIO((self.header or b'') + data), **args)
+
+
+class FollowedFiles:
+    """
+    The x and y columns of files that keep growing, with the mean and the standard deviation across the files of every
+    row that all of them already have. Only the new rows are added and only the new complete rows are calculated, so
+    each update costs the number of new rows, instead of the size of the files
+    """
+    def __init__(self, dfs, x, y):
+        self.columns = [x] + y
+        self.rows = [Buffer(len(self.columns)) for _ in dfs]
+        # the mean and the standard deviation of every y, side by side
+        self.stats = Buffer(2 * len(y))
+        self.add(dfs)
+
+    def add(self, dfs):
+        """
+        Adds the new rows of each file (None if a file didn't grow). Returns the number of complete rows before them, or
+        None if there are no new complete rows
+        """
+        for rows, df in zip(self.rows, dfs):
+            if df is not None and len(df.index):
+                rows.append(df.iloc[:, self.columns].to_numpy(dtype=np.float64))
+
+        old = len(self.stats)
+        complete = min(len(rows) for rows in self.rows)
+        if complete == old:
+            return None
+
+        values = np.stack([rows.view()[old:complete, 1:] for rows in self.rows])
+        stats = np.empty((complete - old, self.stats.array.shape[1]))
+        # rows missing in every file have no mean, and a single file has no standard deviation, like pandas
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            stats[:, 0::2] = np.nanmean(values, axis=0)
+            stats[:, 1::2] = np.nanstd(values, axis=0, ddof=1)
+        self.stats.append(stats)
+        return old
+
+    def x(self):
+        return self.rows[0].view()[:len(self.stats), 0]
+
+
+def band_polygons(bands, colors):
+    """
+    Polygons of the shadows of the lines, with the color of each of them. bands has the x, the lower and the upper limits
+    of each shadow, which is split where there are missing values, like fill_between does
+    """
+    polygons, polygonColors = [], []
+    for (x, lower, upper), color in zip(bands, colors):
+        valid = ~(np.isnan(x) | np.isnan(lower) | np.isnan(upper))
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], valid.view(np.int8), [0]))))
+        for start, end in zip(edges[::2], edges[1::2]):
+            top = np.column_stack((x[start:end], upper[start:end]))
+            bottom = np.column_stack((x[start:end], lower[start:end]))[::-1]
+            polygons.append(np.concatenate((top, bottom)))
+            polygonColors.append(color)
+    return polygons, polygonColors
+
+
 class Plot:
     """
     This function can either be called by command line, in which case self.called_by_cmd will be True, or imported via
@@ -70,7 +989,7 @@ class Plot:
                  separator=',',
                  x='1',
                  y='2',
-                 symbols='.',
+                 symbols=None,
                  distBetSymbols=None,
                  symbolSize=(2,),
                  figSize=None,
@@ -95,12 +1014,40 @@ class Plot:
                  aucm=None,
                  fileExtension='csv',
                  comment="#",
-                 cmd=False):
+                 jobs=1,
+                 columnTypes=None,
+                 cache=None,
+                 cacheSize=1024,
+                 stream=False,
+                 chunkSize=None,
+                 downsample=None,
+                 downsampleMethod='lttb',
+                 density=False,
+                 densityLog=False,
+                 densityColormap=None,
+                 windowType='mean',
+                 aucOutput=None,
+                 aucPercentiles=AUC_PERCENTILES,
+                 stats=False,
+                 statsPercentiles=STATS_PERCENTILES,
+                 profile=False,
+                 profileDump=None,
+                 incremental=False,
+                 follow=None,
+                 align=None,
+                 band='std',
+                 bandPercentiles=None,
+                 bootstrapSamples=1000,
+                 dtype=None,
+                 preflight=True,
+                 countLines=False,
+                 cmd=False,
+                 argv=None):
 
         if cmd:
             # if it is called by command line
             self.called_by_cmd = True
-            self.parseCmd()
+            self.parseCmd(argv)
         else:
             self.called_by_cmd = False
             # if it is called by another program
@@ -121,6 +1068,7 @@ class Plot:
             else:
                 raise Exception(x + " is not a valid column index")
             self.y = self.defineAxis(y)
+            # None, like the command line: a marker on every point of every line costs much more to draw than the lines
             self.symbols = symbols
             self.distBetSymbols = distBetSymbols
             self.symbolSize = symbolSize
@@ -149,19 +1097,65 @@ class Plot:
                 self.aucm = 'simpson'
             self.extension = fileExtension
             self.comment = comment
+            self.header = self.comment == "#"
+            self.jobs = jobs
+            self.columnTypes = columnTypes
+            # None, 'float32' or 'auto', the compact types the columns are parsed as
+            self.dtype = dtype
+            # checks the columns of the files before parsing them, and also counts their lines if countLines is given
+            self.preflight = preflight
+            self.countLines = countLines
+            self.cache = cache
+            self.cacheSize = cacheSize
+            # the stats of files that weren't read yet are always calculated reading one file at a time
+            self.stream = stream or (stats and data is None and fileName is not None)
+            self.chunkSize = chunkSize
+            self.downsample = downsample
+            self.downsampleMethod = downsampleMethod
+            self.density = density
+            self.densityLog = densityLog
+            self.densityColormap = densityColormap
+            self.windowType = windowType
+            self.aucOutput = aucOutput
+            self.aucPercentiles = aucPercentiles
+            self.stats = stats
+            self.statsPercentiles = statsPercentiles
+            # True prints the report to stderr, a file name saves it as JSON
+            self.profile = profile
+            self.profiler = Profiler(profileDump) if profile else None
+            # False, or how the files are fingerprinted: 'mtime' (True is the same) or 'hash'
+            self.incremental = 'mtime' if incremental is True else incremental
+            # seconds between the reads of the rows appended to the files, None doesn't follow them
+            self.follow = follow
+            # None, or how the files are resampled onto common x values: 'union' or 'intersection'
+            self.align = align
+            # the shadow of the plots of several files: 'std', 'quantile' or 'bootstrap'
+            self.band = band
+            self.bandPercentiles = bandPercentiles
+            self.bootstrapSamples = bootstrapSamples
+            self.usecols = None
+            # the positions of x and y among the columns read, the same as the indexes until openFile projects them
+            self.xPos, self.yPos = self.x, self.y
+            self.upToDate = self.incremental and self.checkIncremental(data)
+            # if only the file names were given, read them
+            if data is None and fileName is not None and not self.upToDate:
+                self.fileName = fileName if isinstance(fileName, list) else [fileName]
+                with self.stage('openFile'):
+                    self.data = self.openFile(self.fileName)
         self.colorMap = {"lightblue": -1, "yellow": 0.75, "grey": 0.5, "lightpink": 0.25, "brown": 0.1,
                          "pink": -0.1, "orange": -0.25, "green": -0.5, "dark yellow": -0.75, "blue": -1}
 
-    def parseCmd(self):
-        """Parses and handles all of the possible arguments that can be selected via command line"""
-        self.parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter,
-                                              description="""I can plot 4 types of graphs: Bar, Line, Pie and Scatter""")
-        file_handling = self.parser.add_argument_group("File Handling")
+    @staticmethod
+    def createParser():
+        """Creates the parser of all the command line arguments"""
+        parser = argparse.ArgumentParser(formatter_class=argparse.RawTextHelpFormatter,
+                                         description="""I can plot 4 types of graphs: Bar, Line, Pie and Scatter""")
+        file_handling = parser.add_argument_group("File Handling")
         file_handling.add_argument("-f", "--fileName", nargs='+',
-                                 help="Name of the files that contain the data for the graph. It can be a directory as well, as long as there are csv files in it.",
+                                 help="Name of the files that contain the data for the graph. It can be a directory as well, as long as there are csv files in it. Files compressed with gzip, bz2, xz or zstd are decompressed while they are read.",
                                  required=True)
         file_handling.add_argument("-ext", "--fileExtension", type=str, action='store', default='.csv',
-                                 help="File extension to be chosen if a directory is passed.\nExamples:\n    python3 plotme.py -f dir -y 3-5 -sd -ext txt")
+                                 help="File extension to be chosen if a directory is passed. Compressed files with that extension (such as .csv.gz) are chosen as well.\nExamples:\n    python3 plotme.py -f dir -y 3-5 -sd -ext txt")
         file_handling.add_argument("-ds", "--dontSave",
                                  help="Doesn't save plot.\nExamples:\n    python3 plotme.py -f file -ds\nDefault: False",
                                  action="store_true", default=False)
@@ -174,9 +1168,28 @@ class Plot:
         file_handling.add_argument("-com", "--comment", type=str, default="#", action="store",
                                  help="The character that will indicate if a line should be treated as comment.\nExamples\n    python3 plotme.py -f file -com @")
         file_handling.add_argument("-o", "--output",
-                                 help="Name and/or extension of the output file.\nValid arguments: '.png', 'name', 'name.png'\nExamples:\n    python3 plotme.py -f file -o outputFile\n    python3 plotme.py -f file -o .tiff\n    python3 plotme.py -f file -o export.jpeg\nDefault: .pdf",
+                                 help="Name and/or extension of the output file. Several outputs can be separated by commas, in which case the plot is drawn once and saved to all of them at the same time.\nValid arguments: '.png', 'name', 'name.png', 'name.png,name.pdf'\nExamples:\n    python3 plotme.py -f file -o outputFile\n    python3 plotme.py -f file -o .tiff\n    python3 plotme.py -f file -o export.jpeg\n    python3 plotme.py -f file -o fig.png,fig.pdf,fig.svg\nDefault: .pdf",
                                  default=".pdf")
-        plot_configuration = self.parser.add_argument_group("Plot Configuration")
+        file_handling.add_argument("-j", "--jobs", type=int, action="store", default=1,
+                                 help="Number of files that are read in parallel, and of processes the area under the curve is split among. Values lower than 1 use all the available cores.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -j 8\nDefault: 1")
+        file_handling.add_argument("-ca", "--cache", type=str, action="store", default=None,
+                                 help="Directory where the parsed files are cached, so unchanged files aren't parsed again in the next runs.\nExamples:\n    python3 plotme.py -f file -ca .plotme_cache\nDefault: None")
+        file_handling.add_argument("-cas", "--cacheSize", type=float, action="store", default=1024,
+                                 help="Maximum size of the cache directory in megabytes. The least recently used files are removed first.\nExamples:\n    python3 plotme.py -f file -ca .plotme_cache -cas 4096\nDefault: 1024")
+        file_handling.add_argument("-dt", "--dtype", type=str, default=None, choices=['float32', 'auto'],
+                                 help="Parses the columns into compact types, which roughly halves the memory of large files. float32 parses the y columns as 32 bit floats. auto parses the columns that have decimals as 32 bit floats and converts the integer ones to the smallest integer type that holds them. The stats and the areas are still summed in 64 bits.\nExamples:\n    python3 plotme.py -f huge_file -y 2-10 -dt float32\n    python3 plotme.py -f dir -y 2 -sd -dt auto\nDefault: None (64 bit numbers)")
+        file_handling.add_argument("-npf", "--noPreflight",
+                                 help="Skips the checks made before the files are parsed, which read the header and the first rows of every file, so wrong column indexes, separators and non-numeric columns are found right away. The files already in the cache aren't checked.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -npf\nDefault: False",
+                                 action="store_true", default=False)
+        file_handling.add_argument("-cl", "--countLines",
+                                 help="Counts the lines of the files before they are parsed, scanning every byte of them for newlines, and reports the files with different numbers of lines. Quoted newlines and lines of spaces aren't counted the way the parser counts them, so the rows of the files are still compared after parsing. Compressed files aren't counted.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -cl\nDefault: False",
+                                 action="store_true", default=False)
+        file_handling.add_argument("-sr", "--stream",
+                                 help="Reads the files one at a time while calculating the mean and the standard deviation or the area under the curve, instead of keeping all of them in memory.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -sr\n    python3 plotme.py -f huge_file -y 2 -auc -sr\nDefault: False",
+                                 action="store_true", default=False)
+        file_handling.add_argument("-cs", "--chunkSize", type=int, action="store", default=None,
+                                 help="Number of rows read at a time when streaming the files.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -sr -cs 100000\nDefault: whole file (100000 rows for the area under the curve)")
+        plot_configuration = parser.add_argument_group("Plot Configuration")
         plot_configuration.add_argument("-g", "--graphType",
                                  help="Type of graph that will be plotted\nExamples:\n    python3 plotme.py -f file -g bar\nDefault: line",
                                  default="line", choices=['line', 'pie', 'bar', 'scatter'])
@@ -204,11 +1217,26 @@ class Plot:
         plot_configuration.add_argument("-l", "--lineWidth",
                                help="Size of the line on a Line plot.\nValid arguments: float\nExamples:\n    python3 plotme.py -f file -l 15\nDefault: 1",
                                default=None)
+        plot_configuration.add_argument("-dsp", "--downsample",
+                          help="Reduces the number of points drawn in line plots while keeping their peaks and dips. It can be a number of points or auto, to use the width of the figure.\nExamples:\n    python3 plotme.py -f file -dsp auto\n    python3 plotme.py -f file -dsp 5000\nDefault: None",
+                          default=None)
+        plot_configuration.add_argument("-dsm", "--downsampleMethod",
+                          help="Algorithm used to downsample the lines. lttb is Largest-Triangle-Three-Buckets and minmax keeps the lowest and highest points of each bucket.\nExamples:\n    python3 plotme.py -f file -dsp auto -dsm minmax\nDefault: lttb",
+                          default='lttb', choices=['lttb', 'minmax'])
+        plot_configuration.add_argument("-den", "--density",
+                          help="Draws scatter plots as an image of the number of points in each pixel, which is much faster for large files.\nExamples:\n    python3 plotme.py -f file -g scatter -den\nDefault: False",
+                          action="store_true", default=False)
+        plot_configuration.add_argument("-dlog", "--densityLog",
+                          help="Uses a logarithmic color scale in the density scatter plots.\nExamples:\n    python3 plotme.py -f file -g scatter -den -dlog\nDefault: False",
+                          action="store_true", default=False)
+        plot_configuration.add_argument("-dcm", "--densityColormap",
+                          help="Colormaps of the y-axes in the density scatter plots.\nValid arguments: matplotlib colormap names, the number must match the number of y indexes\nExamples:\n    python3 plotme.py -f file -g scatter -den -y 2,3 -dcm viridis,magma\nSee https://matplotlib.org/stable/tutorials/colors/colormaps.html for more examples\nDefault: shades of the color of each y-axis",
+                          default=None)
         plot_configuration.add_argument("-pl", "--pieLabel",
                           help="Labels of the data in the pie plot.\nValid arguments: strings, the number must match the number of y indexes\nExamples:\n    python3 plotme.py -f file -g pie -pl slice1,'another slice',3\nDefault: 0 - (n-1), n = lenght of y-axis",
                           default=None)
 
-        axis_configuration = self.parser.add_argument_group("Axis Configuration")
+        axis_configuration = parser.add_argument_group("Axis Configuration")
         axis_configuration.add_argument("-x", "--x",
                                  help="The x-axis of the plot.\nValid arguments: Indexes of columns\nExamples:\n    python3 plotme.py -f file -x 1\nDefault: 1",
                                  default=1)
@@ -234,7 +1262,7 @@ class Plot:
                           help="Label of the y-axis.\nValid arguments: string\nExamples:\n    python3 plotme.py -f file -yl 'label of y'\nDefault: header of the last y-axis",
                           default=None)
 
-        color_configuration = self.parser.add_argument_group("Color Configuration")
+        color_configuration = parser.add_argument_group("Color Configuration")
         color_configuration.add_argument("-p", "--setPalette",
                                help="Graph color palette\nExamples:\n    python3 plotme.py -f file -p deep\nDefault: colorblind",
                                default="colorblind",
@@ -249,23 +1277,63 @@ class Plot:
                                help="Selects the colors of the plotted y-axes in the scatter and line plots.\nValid arguments: 'red','black','lightyellow','#abc','#ff701E'\nExamples:\n    python3 plotme.py -f file -y 2,4 -c yellow,green\n    python3 plotme.py -f file -y 2,4 -c '#ff701E','#abc'\nSee https://matplotlib.org/stable/tutorials/colors/colors.html for more examples\nDefault: cycles colormap",
                                default=None)
 
-        miscellaneous = self.parser.add_argument_group("Miscellaneous")
+        miscellaneous = parser.add_argument_group("Miscellaneous")
 
         miscellaneous.add_argument("-w", "--movingAverageWindow",
                                         help="Moving average window\nExamples:\n    python3 plotme.py -f file -w 100",
                                         default=1)
+        miscellaneous.add_argument("-wt", "--windowType",
+                                        help="Kind of moving average. mean is the simple moving average, ema the exponential moving average (with span equal to the window) and median the centered rolling median.\nExamples:\n    python3 plotme.py -f file1 file2 -sd -w 100 -wt ema\nDefault: mean",
+                                        default='mean', choices=['mean', 'ema', 'median'])
         miscellaneous.add_argument("-sd", "--standardDeviation",
                                  help="Makes a plot of the mean and the standard deviation over all the files, ploting the shadow.\nExamples:\n    python3 plotme.py -f file1 file2 file3 [...] -y 2 -sd\n    python3 plotme.py -f file1 file2 file3 -y 2-4,7 -sd\nDefault: False",
                                  action='store_true', default=False)
+        miscellaneous.add_argument("-bd", "--band", type=str, default='std', choices=['std', 'quantile', 'bootstrap'],
+                                 help="Shadow of the plots of several files. std is the mean and one standard deviation, quantile is the median and two percentiles of the files (which suits skewed data better) and bootstrap is the mean and its bootstrap confidence interval. When streaming, the files are written to a temporary file as they are read, and the quantiles are calculated from it a block of rows at a time, so they are exact and the memory doesn't depend on the number of rows. The bootstrap can't be used while streaming.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -bd quantile\n    python3 plotme.py -f dir -y 2 -sd -bd quantile -bdp 5 95\n    python3 plotme.py -f dir -y 2 -sd -bd bootstrap -bds 2000\nDefault: std")
+        miscellaneous.add_argument("-bdp", "--bandPercentiles", type=float, nargs=2, default=None,
+                                 help="Lower and upper percentiles of the quantile and bootstrap shadows.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -bd quantile -bdp 5 95\nDefault: 25 75 for quantile, 2.5 97.5 for bootstrap")
+        miscellaneous.add_argument("-bds", "--bootstrapSamples", type=int, default=1000,
+                                 help="Number of resamples of the bootstrap shadow.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -bd bootstrap -bds 5000\nDefault: 1000")
         miscellaneous.add_argument("-auc", "--areaUnderCurve",
                                  help="Calculates the area under the curve given the file(s) and the y index(es).\nExamples:\n    python3 plotme.py -f file -y 4-6 -auc\n    python3 plotme.py -f file1 file2 file3 [...] -y 3,4 -auc\nDefault: False",
                                  action="store_true", default=False)
         miscellaneous.add_argument("-aucm", "--areaUnderCurveMethod", type=str, action='store',
                                  choices=['simpson', 'trapz', 'mean'], default=None,
                                  help='The method that is going to be used for the auc calculation. It can be the simpson rule, the trapezoidal rule or the mean of them.\nExamples:\n    python3 plotme.py -f file -y 2-4 -auc -aucm simpson\n    python3 plotme.py -f file -y 5 -auc -aucm trapz\nDefault: simspon')
+        miscellaneous.add_argument("-auco", "--aucOutput", type=str, action='store', default=None,
+                                 help='File where the areas of every file and column are saved, with their statistics across the files. The format is chosen by the extension: csv (the statistics go to a second file ending in _summary.csv), json or npz.\nExamples:\n    python3 plotme.py -f dir -y 2-4 -auc -auco areas.csv\n    python3 plotme.py -f dir -y 2 -auc -auco areas.json\nDefault: None')
+        miscellaneous.add_argument("-aucp", "--aucPercentiles", type=float, nargs='+', action='store',
+                                 default=list(AUC_PERCENTILES),
+                                 help='Percentiles of the areas across the files that are saved with -auco.\nExamples:\n    python3 plotme.py -f dir -y 2 -auc -auco areas.json -aucp 10 50 90\nDefault: 5 25 50 75 95')
+        miscellaneous.add_argument("-sts", "--stats",
+                                 help="Shows the count, mean, standard deviation, minimum, maximum and approximate percentiles of the y columns over all the rows of all the files, reading one file (or one chunk of rows) at a time. If activated, doesn't generate a plot.\nExamples:\n    python3 plotme.py -f dir -y 2-4 -sts\n    python3 plotme.py -f dir -y 2 -sts -cs 100000 -j 4\nDefault: False",
+                                 action="store_true", default=False)
+        miscellaneous.add_argument("-stp", "--statsPercentiles", type=float, nargs='+', action='store',
+                                 default=list(STATS_PERCENTILES),
+                                 help='Percentiles shown by the stats mode.\nExamples:\n    python3 plotme.py -f dir -y 2 -sts -stp 1 50 99\nDefault: 25 50 75')
+        miscellaneous.add_argument("-prof", "--profile", type=str, nargs='?', const=True, default=False,
+                                 help="Measures the wall time, the CPU time, how much the peak RSS grew and the peak memory allocated by Python of each stage (reading, importing pyplot, checking, plotting, saving), next to the peak RSS of the process so far. The report is printed to stderr, or saved as JSON if a file name is given.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -prof\n    python3 plotme.py -f dir -y 2 -sd -prof profile.json\nDefault: False")
+        miscellaneous.add_argument("-profd", "--profileDump", type=str, action='store', default=None,
+                                 help="File where the cProfile statistics of the slowest stage are saved, when profiling. They can be read with pstats or snakeviz.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -prof -profd slowest.prof\nDefault: None")
+        miscellaneous.add_argument("-inc", "--incremental", type=str, nargs='?', const='mtime', default=False,
+                                 choices=['mtime', 'hash'],
+                                 help="Only makes the plot if its files or its options changed since the last run, which is known by a fingerprint saved next to the output. The files are compared by their size and modification time (mtime) or by their content (hash). The output keeps the same name in every run, instead of getting a new number.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -inc\n    python3 plotme.py -f dir -y 2 -sd -o fig.png,fig.pdf -inc hash\nDefault: False")
+        miscellaneous.add_argument("-al", "--align", type=str, default=None, choices=['union', 'intersection'],
+                                 help="Resamples the files onto common x values by linear interpolation before calculating the mean and the standard deviation, so runs of different lengths or logged at different steps can be compared. union uses every x of every file, and each file only counts where it has data. intersection only uses the x values inside the range all the files cover.\nExamples:\n    python3 plotme.py -f dir -y 2 -sd -al union\n    python3 plotme.py -f dir -y 2-4 -sd -w 20 -al intersection\nDefault: None (the rows of the files must match)")
+        miscellaneous.add_argument("-fol", "--follow", type=float, nargs='?', const=2.0, default=None,
+                                 help="Keeps following the files of a line plot while they are written, like tail -f. Every given number of seconds only the new lines are read, and the lines (and the mean and standard deviation of the files) are updated with them. The plot is saved again, or redrawn if it is displayed, until it is interrupted with Ctrl+C.\nExamples:\n    python3 plotme.py -f log.csv -y 2,3 -o live.png -fol\n    python3 plotme.py -f dir -y 2 -sd -w 50 -dp -fol 0.5\nDefault: None (2 seconds if no value is given)")
+
+        return parser
+
+    def parseCmd(self, argv=None):
+        """
+        Parses and handles all of the possible arguments that can be selected via command line. If argv is given, it is
+        parsed instead of the arguments of the script
+        """
+        self.parser = Plot.createParser()
 
         # and put the values in the class variables
-        args = self.parser.parse_args()
+        args = self.parser.parse_args(argv)
         self.fileName = args.fileName
         self.dontSave = args.dontSave
         self.displayPlot = args.displayPlot
@@ -294,11 +1362,40 @@ class Plot:
         self.yLabel = args.yLabel
         self.comment = args.comment
         self.pieLabel = args.pieLabel
+        self.jobs = args.jobs
+        self.columnTypes = None
+        self.dtype = args.dtype
+        self.preflight = not args.noPreflight
+        self.countLines = args.countLines
+        self.cache = args.cache
+        self.cacheSize = args.cacheSize
+        self.stats = args.stats
+        self.statsPercentiles = args.statsPercentiles
+        # the stats are always calculated reading one file at a time
+        self.stream = args.stream or self.stats
+        self.chunkSize = args.chunkSize
+        self.downsample = args.downsample
+        self.downsampleMethod = args.downsampleMethod
+        self.density = args.density
+        self.densityLog = args.densityLog
+        self.densityColormap = args.densityColormap
+        self.windowType = args.windowType
+        self.aucOutput = args.aucOutput
+        self.aucPercentiles = args.aucPercentiles
+        self.profile = args.profile
+        self.profiler = Profiler(args.profileDump) if args.profile else None
+        self.incremental = args.incremental
+        self.follow = args.follow
+        self.align = args.align
+        self.band = args.band
+        self.bandPercentiles = args.bandPercentiles
+        self.bootstrapSamples = args.bootstrapSamples
+        self.usecols = None
+        self.xPos, self.yPos = self.x, self.y
         if self.comment != "#":
             self.header = False
         else:
             self.header = True
-        self.data = self.openFile(self.fileName)
         self.bgColor = args.bgColor
         self.gColor = args.gColor
         self.colors = args.colors
@@ -312,6 +1409,14 @@ class Plot:
         else:
             self.aucm = 'simpson'
 
+        # an incremental plot whose files and options didn't change isn't even read
+        self.upToDate = bool(self.incremental) and self.checkIncremental()
+        if self.upToDate:
+            self.data = None
+            return
+        with self.stage('openFile'):
+            self.data = self.openFile(self.fileName)
+
     def getAxisName(self, df, y, x):
         """Searches for the names of the columns in x and y from the data so as to name the axis"""
         columns = df.columns
@@ -327,47 +1432,107 @@ class Plot:
 
         return columns, yColumns, xColumn
 
+    def getDownsampleSize(self, ax1):
+        """
+        Number of points each line is reduced to, or None if the lines shouldn't be downsampled. With auto, two points
+        are kept for every pixel of the width of the axes
+        """
+        if not self.downsample:
+            return None
+        if self.downsample == 'auto':
+            return 2 * int(ax1.get_window_extent().width)
+        return int(self.downsample)
+
+    def downsampleIndexes(self, x, y, size):
+        """Indexes of the points of the line that are kept"""
+        if self.downsampleMethod == 'minmax':
+            return minmax(y, size)
+        return lttb(x, y, size)
+
     def moving_average(self, interval, window_size):
-        if window_size == 1:
+        """
+        Smooths a Series, or every column of a DataFrame or 2D array at once, with the kind of window in windowType.
+        The simple moving average uses cumulative sums, so its cost doesn't depend on the size of the window. The value
+        at each row is the mean of the window starting at it, so the last window_size - 1 rows are NaN
+        """
+        if int(window_size) == 1:
             return interval
-        window = np.ones(int(window_size)) / float(window_size)
-        return pd.Series(np.convolve(interval, window, 'valid'))
+        window_size = int(window_size)
+
+        values = np.asarray(interval, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, None]
+
+        if self.windowType == 'ema':
+            result = pd.DataFrame(values).ewm(span=window_size, adjust=False).mean().to_numpy()
+        elif self.windowType == 'median':
+            result = pd.DataFrame(values).rolling(window_size, center=True).median().to_numpy()
+        else:
+            # windows that contain a NaN are NaN, instead of spreading it to the rest of the cumulative sum
+            missing = np.isnan(values)
+            sums = np.cumsum(np.vstack((np.zeros((1, values.shape[1])), np.where(missing, 0, values))), axis=0)
+            nans = np.cumsum(np.vstack((np.zeros((1, values.shape[1])), missing)), axis=0)
+            result = np.full(values.shape, np.nan)
+            windows = (sums[window_size:] - sums[:-window_size]) / window_size
+            result[:len(windows)] = np.where(nans[window_size:] > nans[:-window_size], np.nan, windows)
+
+        if isinstance(interval, pd.DataFrame):
+            return pd.DataFrame(result, index=interval.index, columns=interval.columns)
+        if isinstance(interval, pd.Series):
+            return pd.Series(result[:, 0], index=interval.index, name=interval.name)
+        return result if np.ndim(interval) > 1 else result[:, 0]
 
     def plotSD(self, data, yInput, ax1):
-        """Plots the mean and the standard deviation of several files"""
+        """
+        Plots the mean and the standard deviation of several files, or the median and its percentiles, or the mean and
+        its bootstrap confidence interval, according to self.band
+        """
         #TODO: check if all files are compatible to calculate standard deviation
         cols, yAxis = [], []
         if self.sd:
-            if len(data) == 1:
+            if self.countFiles() == 1:
                 if self.called_by_cmd:
                     print('To plot standard deviation, more than one file is required')
                     sys.exit()
                 else:
                     raise Exception('To plot standard deviation, more than one file is required')
         for df in data:
-            col, y, _ = self.getAxisName(df, yInput, self.x)
+            col, y, _ = self.getAxisName(df, yInput, self.xPos)
             cols.append(col)
             yAxis.append(y)
 
         # get all the stats data - the mean and standard deviation
-        stats = []
-        for y_count in range(len(yInput)):
-            col_data = []
+        # (or the line and the limits of its shadow, for the other bands)
+        x = data[0][data[0].columns[self.xPos]]
+        if self.stream:
+            stats = self.streamStats(yInput)
+        elif self.align or self.band != 'std':
+            # the stats are calculated over the runs stacked in a single array
+            if self.align:
+                x, values = self.alignFiles(data, yInput)
+            else:
+                values = np.stack([df.iloc[:, yInput].to_numpy(dtype=np.float64) for df in data])
+            stats = self.bandStats(values)
+        else:
+            stats = []
+            for y_count in range(len(yInput)):
+                col_data = []
 
-            for file_count in range(len(yAxis)):
-                col_data.append(data[file_count][yAxis[file_count][y_count]])
+                for file_count in range(len(yAxis)):
+                    col_data.append(data[file_count][yAxis[file_count][y_count]])
 
-            df = pd.concat(col_data, axis=1)
-            stats.append({
-                'mean': df[df.columns].mean(axis=1),
-                'std': df[df.columns].std(axis=1)
-            })
+                # float32 columns are summed in float64, so the stats keep their precision
+                df = pd.concat(col_data, axis=1).astype(np.float64, copy=False)
+                stats.append({
+                    'mean': df[df.columns].mean(axis=1),
+                    'std': df[df.columns].std(axis=1)
+                })
 
         # create all the datasets containing the mean,std and x information        
         df = []
         for i in range(len(stats)):
             df.append(pd.DataFrame.from_dict(stats[i]))
-            df[i]['x'] = data[0][data[0].columns[self.x]]
+            df[i]['x'] = x
 
         # gets the arguments
         args = self.getParameters(x='x', y=['mean'])
@@ -382,24 +1547,402 @@ class Plot:
             args.pop('marker')
 
         # finally, makes the plot
-        for i in range(len(df)):
-            if int(self.w) > 1:
-                df[i]['std'] = self.moving_average(df[i]['std'], self.w)
-                df[i]['mean'] = self.moving_average(df[i]['mean'], self.w)
+        names = list(stats[0].keys())
+        if int(self.w) > 1:
+            # the means and standard deviations (or the limits of the shadows) of every y are smoothed together
+            smooth = self.moving_average(np.column_stack([vals[names] for vals in df]), self.w)
+            for i in range(len(df)):
+                for j, name in enumerate(names):
+                    df[i][name] = smooth[:, len(names) * i + j]
+        size = self.getDownsampleSize(ax1)
+        xs, means, bands = [], [], []
         for vals in df:
-            color = next(colors)
+            mean = vals['mean'].to_numpy(dtype=np.float64)
+            if 'std' in vals:
+                std = vals['std'].to_numpy(dtype=np.float64)
+                lower, upper = mean - std, mean + std
+            else:
+                lower, upper = vals['lower'].to_numpy(dtype=np.float64), vals['upper'].to_numpy(dtype=np.float64)
+            x, mean, band = self.sdSeries(vals['x'].to_numpy(dtype=np.float64), mean, lower, upper, size)
+            xs.append(x)
+            means.append(mean)
+            bands.append(band)
+
+        # put the legend of the first csv file
+        xColumn = data[0].columns[self.xPos]
+        self.drawLines(ax1, xColumn, xs, means, yAxis[0], colors, markers, args, bands if self.sd else None)
+
+    def alignFiles(self, data, yInput):
+        """
+        Resamples all the files onto a common grid of x values, the union of the x of all the files or their
+        intersection according to self.align. Returns the grid and the y values of every file at each point of the grid
+        (files, grid, y), which are NaN where a file doesn't reach
+        """
+        xs, ys = [], []
+        for df in data:
+            x = df.iloc[:, self.xPos]
+            if not pd.api.types.is_numeric_dtype(x):
+                message = "The files can only be aligned by a numeric x column"
+                if self.called_by_cmd:
+                    print(message)
+                    sys.exit()
+                else:
+                    raise Exception(message)
+            xs.append(x.to_numpy(dtype=np.float64))
+            ys.append(df.iloc[:, yInput].to_numpy(dtype=np.float64))
 
+        return align_runs(xs, ys, self.align)
+
+    def getBandPercentiles(self):
+        if self.bandPercentiles:
+            return self.bandPercentiles
+        return QUANTILE_BAND if self.band == 'quantile' else BOOTSTRAP_BAND
+
+    def bandStats(self, values):
+        """
+        Calculates the line and the shadow of every y over the stacked runs (files, rows, y), ignoring the NaN values:
+        the mean and the standard deviation, the median and two percentiles, or the mean and a bootstrap confidence
+        interval. The line is always called mean
+        """
+        # rows without values have no mean, and a single file has no standard deviation, like pandas
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            if self.band == 'quantile':
+                low, high = self.getBandPercentiles()
+                lower, mean, upper = nan_quantiles(values, [low / 100, 0.5, high / 100])
+            else:
+                mean = np.nanmean(values, axis=0)
+                if self.band == 'bootstrap':
+                    lower, upper = bootstrap_interval(values, self.getBandPercentiles(), int(self.bootstrapSamples))
+                else:
+                    std = np.nanstd(values, axis=0, ddof=1)
+                    return [{'mean': mean[:, i], 'std': std[:, i]} for i in range(values.shape[2])]
+        return [{'mean': mean[:, i], 'lower': lower[:, i], 'upper': upper[:, i]} for i in range(values.shape[2])]
+
+    def sdSeries(self, x, mean, lower, upper, size=None):
+        """The points of the line of a mean and of its shadow, downsampled to size points if size is given"""
+        band = x, lower, upper
+        if size:
+            # the mean is downsampled as a line and the shadow as an envelope, so both keep their peaks
+            band = envelope(x, lower, upper, size)
+            indexes = self.downsampleIndexes(x, mean, size)
+            x, mean = x[indexes], mean[indexes]
+        return x, mean, band
+
+    def drawLines(self, ax1, xColumn, xs, ys, labels, colors, markers, args, bands=None):
+        """
+        Draws all the lines as a single LineCollection (and their shadows as a single PolyCollection), instead of one
+        pandas plot per column, which is much faster when there are many columns. xs and ys have the points of each
+        line, bands has the x, the lower and the upper limits of each shadow. Markers are drawn over the lines that
+        have one, and the legend is made of one entry per line. Returns the artists, so they can be updated later
+        """
+        from matplotlib.collections import LineCollection, PolyCollection
+        from matplotlib.lines import Line2D
+
+        colors = [next(colors) for _ in labels]
+        # the last marker is repeated for the remaining lines
+        markers = [markers[min(i, len(markers) - 1)] for i in range(len(labels))]
+        width = float(args['linewidth']) if 'linewidth' in args else None
+        if 'figsize' in args:
+            ax1.figure.set_size_inches(args['figsize'])
+
+        shadows = None
+        if bands:
+            polygons, polygonColors = band_polygons(bands, colors)
+            shadows = PolyCollection(polygons, facecolors=polygonColors, edgecolors=polygonColors, alpha=0.15,
+                                     rasterized=True)
+            ax1.add_collection(shadows)
+
+        lines = LineCollection([np.column_stack((x, y)) for x, y in zip(xs, ys)], colors=colors, linewidths=width)
+        ax1.add_collection(lines)
+
+        handles, markerLines = [], []
+        for x, y, color, marker in zip(xs, ys, colors, markers):
+            markerLine = None
+            if marker:
+                markerLine, = ax1.plot(x, y, linestyle='', marker=marker, color=color,
+                                       markersize=args.get('markersize'), markevery=args.get('markevery'))
+            markerLines.append(markerLine)
+            handles.append(Line2D([], [], color=color, linewidth=width, marker=marker or None,
+                                  markersize=args.get('markersize')))
+        ax1.legend(handles, labels)
+
+        # the same decorations of a pandas line plot
+        ax1.autoscale_view()
+        if 'xlim' in args:
+            ax1.set_xlim(*args['xlim'])
+        if 'ylim' in args:
+            ax1.set_ylim(*args['ylim'])
+        if 'title' in args:
+            ax1.set_title(args['title'])
+        if 'fontsize' in args:
+            ax1.tick_params(labelsize=args['fontsize'])
+        ax1.set_xlabel(xColumn)
+        return lines, markerLines, shadows, colors
+
+    def drawFollowed(self, ax1):
+        """
+        Draws the rows of the followed files read so far, as a line plot or as the mean and the standard deviation of
+        the files, keeping what is needed to add the rows that are appended later. Returns the artists of the lines
+        """
+        if self.sd and self.countFiles() == 1:
+            if self.called_by_cmd:
+                print('To plot standard deviation, more than one file is required')
+                sys.exit()
+            else:
+                raise Exception('To plot standard deviation, more than one file is required')
 
-            vals.plot(kind='line', ax=ax1, marker=markers[0], color=color, **args)
-            if self.sd:
-                plt.fill_between(vals['x'], vals['mean'] + vals['std'], vals['mean'] - vals['std'], color=color, alpha=0.15,
-                             rasterized=True)
+        self.followed = FollowedFiles(self.data, self.xPos, self.yPos)
+        if int(self.w) > 1:
+            self.smoothed = Buffer(2 * len(self.y))
+            self.smoothTail(0)
 
-            if len(markers) > 1:
-                markers.pop(0)
+        columns, yColumns, xColumn = self.getAxisName(self.data[0], self.yPos, self.xPos)
+        args = self.getParameters(xColumn)
 
-        # put the legend of the first csv file
-        ax1.legend(yAxis[0])
+        if self.colors:
+            colors = self.colors
+        else:
+            colors = itertools.cycle(args['colormap'].colors)
+        args.pop('colormap')
+        markers = args['marker'] if 'marker' in args else ['']
+        if 'marker' in args:
+            args.pop('marker')
+
+        xs, ys, bands = self.followSeries(ax1)
+        return self.drawLines(ax1, xColumn, xs, ys, yColumns, colors, markers, args, bands)
+
+    def followSeries(self, ax1):
+        """The points of the lines, and of their shadows if there are any, of the rows read so far"""
+        size = self.getDownsampleSize(ax1)
+        x = self.followed.x()
+
+        if not self.sd and int(self.w) == 1:
+            xs, ys = [], []
+            for values in self.followed.rows[0].view()[:, 1:].T:
+                # each line keeps its own points when downsampled
+                indexes = self.downsampleIndexes(x, values, size) if size else slice(None)
+                xs.append(x[indexes])
+                ys.append(values[indexes])
+            return xs, ys, None
+
+        stats = (self.smoothed if int(self.w) > 1 else self.followed.stats).view()
+        xs, means, bands = [], [], []
+        for i in range(len(self.y)):
+            mean, std = stats[:, 2 * i], stats[:, 2 * i + 1]
+            line, mean, band = self.sdSeries(x, mean, mean - std, mean + std, size)
+            xs.append(line)
+            means.append(mean)
+            bands.append(band)
+        return xs, means, bands if self.sd else None
+
+    def smoothTail(self, old):
+        """
+        Smooths the means and the standard deviations of the rows from old on, and of the rows before them whose windows
+        reach the new rows. The rows before those can't change anymore, so they aren't smoothed again
+        """
+        w = int(self.w)
+        stats = self.followed.stats.view()
+        if self.windowType == 'ema' and old > 0:
+            # the exponential average goes on from the last row that was smoothed
+            start = old
+            smooth = self.moving_average(np.vstack((self.smoothed.view()[old - 1:old], stats[old:])), w)[1:]
+        else:
+            # the windows of the mean start at each row and the ones of the median are centered on it, so a window
+            # before the rows reaches them
+            start = max(0, old - w)
+            first = max(0, start - w)
+            smooth = self.moving_average(stats[first:], w)[start - first:]
+        self.smoothed.write(start, smooth)
+
+    def updateLines(self, ax1, artists, xs, ys, bands=None):
+        """Replaces the points of the lines, markers and shadows drawn by drawLines, and rescales the axes to them"""
+        lines, markerLines, shadows, colors = artists
+        segments = [np.column_stack((x, y)) for x, y in zip(xs, ys)]
+        lines.set_segments(segments)
+        for markerLine, x, y in zip(markerLines, xs, ys):
+            if markerLine is not None:
+                markerLine.set_data(x, y)
+
+        points = segments
+        if shadows is not None:
+            polygons, polygonColors = band_polygons(bands, colors)
+            shadows.set_verts(polygons)
+            shadows.set_facecolor(polygonColors)
+            shadows.set_edgecolor(polygonColors)
+            points = points + polygons
+
+        # relim only knows about the lines, so the points of the collections are added to the limits by hand
+        ax1.relim()
+        for xy in points:
+            if len(xy):
+                ax1.update_datalim(xy)
+        ax1.autoscale_view()
+
+    def followFiles(self, fig, ax1, artists, refreshes=None):
+        """
+        Reads the rows appended to the files every self.follow seconds, updates the lines with them and saves the plot
+        again (or redraws it, if it is displayed). It goes on until it is interrupted, or for the given number of
+        refreshes
+        """
+        plt = load_pyplot(self.displayPlot)
+        if self.displayPlot:
+            plt.show(block=False)
+        outputs = []
+        if not self.dontSave:
+            outputs = self.outputFile if isinstance(self.outputFile, list) else [self.outputFile]
+
+        count = 0
+        try:
+            while refreshes is None or count < refreshes:
+                if self.displayPlot:
+                    plt.pause(float(self.follow))
+                else:
+                    time.sleep(float(self.follow))
+                count += 1
+
+                dfs = [tail.parse(self.readArgs) for tail in self.tails]
+                if not self.followedNames:
+                    self.nameFollowed(ax1, dfs)
+                old = self.followed.add(dfs)
+                if old is None:
+                    continue
+                if int(self.w) > 1:
+                    self.smoothTail(old)
+                self.updateLines(ax1, artists, *self.followSeries(ax1))
+
+                if self.displayPlot:
+                    fig.canvas.draw_idle()
+                for filename in outputs:
+                    if filename:
+                        save_figure(fig, filename)
+        except KeyboardInterrupt:
+            pass
+
+    def nameFollowed(self, ax1, dfs):
+        """
+        Names the x axis and the lines with the columns of the first followed file that has a header, when none of
+        them had one yet when the plot was drawn
+        """
+        df = next((df for df in dfs if df is not None), None)
+        if df is None:
+            return
+        self.followedNames = True
+        _, yColumns, xColumn = self.getAxisName(df, self.yPos, self.xPos)
+        if not self.xLabel:
+            ax1.set_xlabel(xColumn)
+        for text, column in zip(ax1.get_legend().get_texts(), yColumns):
+            text.set_text(column)
+
+    def streamStats(self, yInput):
+        """
+        Calculates the mean and the standard deviation of the y columns (or the quantile band) reading one file (or one
+        chunk of rows) at a time, so the memory used doesn't depend on the number of files
+        """
+        rows = len(self.data[0].index)
+        stats = RunningStats((rows, len(yInput)))
+        # the quantiles need the values of every file at each row, so the files are written one after the other to a
+        # temporary file, which is read back a block of rows of every file at a time
+        spill = tempfile.TemporaryFile() if self.band == 'quantile' else None
+
+        try:
+            for i, fname in enumerate(self.files):
+                read = 0
+                # the first file is already in memory
+                chunks = [self.data[0]] if i == 0 else self.readChunks(fname)
+                for chunk in chunks:
+                    values = chunk.iloc[:, yInput].to_numpy(dtype=np.float64)
+                    if read + len(values) > rows:
+                        read = -1
+                        break
+                    stats.update(values, slice(read, read + len(values)))
+                    if spill is not None:
+                        spill.write(np.ascontiguousarray(values).tobytes())
+                    read += len(values)
+
+                if read != rows:
+                    message = ("The files that were given have different numbers of rows, which is incoherent for the "
+                               "analysis")
+                    if self.called_by_cmd:
+                        print(message)
+                        sys.exit()
+                    else:
+                        raise Exception(message)
+
+            mean, std = stats.getMean(), stats.getStd()
+            if spill is None:
+                return [{'mean': pd.Series(mean[:, i]), 'std': pd.Series(std[:, i])} for i in range(len(yInput))]
+
+            lower, median, upper = self.spilledQuantiles(spill, rows, len(yInput))
+        finally:
+            if spill is not None:
+                spill.close()
+        return [{'mean': pd.Series(median[:, i]), 'lower': pd.Series(lower[:, i]), 'upper': pd.Series(upper[:, i])}
+                for i in range(len(yInput))]
+
+    def spilledQuantiles(self, spill, rows, columns):
+        """
+        Exact quantiles of the band over the files written to the spill file, each of them rows x columns floats. The
+        rows are read in blocks that fit QUANTILE_BLOCK values of all the files, so the memory used doesn't depend on
+        the number of rows
+        """
+        low, high = self.getBandPercentiles()
+        qs = [low / 100, 0.5, high / 100]
+        files = len(self.files)
+        block = max(QUANTILE_BLOCK // (files * columns), 1)
+        values = np.empty((files, min(block, rows), columns))
+        quantiles = np.empty((len(qs), rows, columns))
+        for start in range(0, rows, block):
+            size = min(block, rows - start)
+            for i in range(files):
+                spill.seek((i * rows + start) * columns * values.itemsize)
+                spill.readinto(values[i, :size])
+            quantiles[:, start:start + size] = nan_quantiles(values[:, :size], qs)
+        return quantiles
+
+    def readChunks(self, fname):
+        """
+        Reads a file in chunks of chunkSize rows, or the whole file at once if no size was given, in the compact types
+        of dtype, like openFile reads the first file
+        """
+        if self.chunkSize:
+            chunks = read_table(fname, chunksize=int(self.chunkSize), **self.readArgs)
+            if self.dtype:
+                return (compact_types(chunk, self.dtype, self.yPos) for chunk in chunks)
+            return chunks
+        cache = FileCache(self.cache, self.cacheSize) if self.cache else None
+        return [read_data_file(fname, self.readArgs, cache, self.dtype, self.yPos)]
+
+    def describeFiles(self):
+        """
+        Calculates the statistics of the y columns over all the rows of all the files. When streaming, the files are
+        read one at a time (or one chunk of rows at a time) and their statistics are merged, so the memory used doesn't
+        depend on the size or the number of the files
+        """
+        columns = list(self.yPos)
+        if self.stream:
+            chunkSize = int(self.chunkSize or 100000)
+            jobs = self.jobs if self.jobs > 0 else os.cpu_count()
+            args = (itertools.repeat(self.readArgs), itertools.repeat(chunkSize), itertools.repeat(columns))
+            if jobs > 1 and len(self.files) > 1:
+                with ProcessPoolExecutor(max_workers=min(jobs, len(self.files))) as executor:
+                    results = list(executor.map(describe_file, self.files, *args))
+            else:
+                results = list(map(describe_file, self.files, *args))
+            stats = results[0]
+            for result in results[1:]:
+                stats.merge(result)
+        else:
+            stats = ColumnStats(len(columns))
+            for df in self.data:
+                stats.update(df.iloc[:, columns].to_numpy(dtype=np.float64))
+
+        names = [self.data[0].columns[y] for y in columns]
+        return stats.describe(names, [p / 100 for p in self.statsPercentiles])
+
+    def countFiles(self):
+        """When streaming, only the first file is kept in self.data"""
+        return len(self.files) if self.stream else len(self.data)
 
     def checkConditions(self):
         """
@@ -418,8 +1961,8 @@ class Plot:
                     raise Exception("The number of declared colors is different than the number of y-axes")
 
         # if the conditions for a confidence interval plot doesn't fit, show the error
-        if len(self.data) > 1:
-            if self.auc:
+        if self.countFiles() > 1:
+            if self.auc or self.stats:
                 pass
             elif self.graphType != 'line' or self.sd != True:
                 if self.called_by_cmd:
@@ -431,10 +1974,64 @@ class Plot:
                         'More than one file is allowed only for line plots with confidence intervals and for finding '
                         'the area under the curve')
 
+        # data given by another script can't be followed, as there are no files to read
+        if self.follow is not None and (self.graphType != 'line' or self.auc or self.stats or self.stream
+                            or not hasattr(self, 'tails')):
+            if self.called_by_cmd:
+                print('Only the files read by line plots can be followed, without streaming')
+                sys.exit()
+            else:
+                raise Exception('Only the files read by line plots can be followed, without streaming')
+
+        # the other shadows of followed files would have to be calculated again for every new row
+        if self.band != 'std' and self.follow is not None:
+            if self.called_by_cmd:
+                print("Only the standard deviation shadow can be used while following the files")
+                sys.exit()
+            else:
+                raise Exception("Only the standard deviation shadow can be used while following the files")
+
+        # every resample has a mean at every position, which would take more memory than the files themselves
+        if self.band == 'bootstrap' and self.stream:
+            if self.called_by_cmd:
+                print("The bootstrap shadow can't be used while streaming the files")
+                sys.exit()
+            else:
+                raise Exception("The bootstrap shadow can't be used while streaming the files")
+
+        # aligned files are resampled onto the same x values, which needs all of them in memory
+        if self.align and (self.stream or self.follow is not None):
+            if self.called_by_cmd:
+                print("The files can't be aligned while streaming or following them")
+                sys.exit()
+            else:
+                raise Exception("The files can't be aligned while streaming or following them")
+
+        # only the mean and the standard deviation of the files (or their moving average) are calculated on aligned x
+        if self.align and not self.sd and int(self.w) == 1:
+            message = "The files can only be aligned for their standard deviation (-sd) or moving average (-w)"
+            if self.called_by_cmd:
+                print(message)
+                sys.exit()
+            else:
+                raise Exception(message)
+
+        # the density of the points is only drawn by scatter plots
+        if self.density and self.graphType != 'scatter':
+            if self.called_by_cmd:
+                print("The density of the points can only be drawn by scatter plots")
+                sys.exit()
+            else:
+                raise Exception("The density of the points can only be drawn by scatter plots")
+
         # check if all the dfs have the same number of rows
+        # when streaming, the files are checked while they are read
+        # the stats don't compare the rows of different files, so their lengths may differ
+        # followed files are still being written, so only the rows all of them have are plotted
+        # aligned files may have any number of rows
         rows = len(self.data[0].index)
         for df in self.data:
-            if len(df.index) != rows:
+            if len(df.index) != rows and not self.stats and self.follow is None and not self.align:
                 if self.called_by_cmd:
                     print(
                         "The files that were given have different numbers of rows, which is incoherent for the analysis")
@@ -457,9 +2054,10 @@ class Plot:
             else:
                 raise Exception("The data can't be parsed by the current separator")
 
-        for y in self.y:
+        for y in self.yPos:
             column_name = self.data[0].columns[y]
-            if not isinstance(self.data[0][column_name][0], numbers.Number):
+            # followed files may not have rows yet
+            if len(self.data[0].index) and not isinstance(self.data[0][column_name][0], numbers.Number):
                 message = "Invalid data type for column '" + column_name + "'"
                 if self.called_by_cmd:
                     print(message)
@@ -475,49 +2073,97 @@ class Plot:
         plot(s).
         """
 
+        if self.upToDate:
+            for filename in self.incrementalOutputs:
+                print(f'File {filename} is up to date')
+            self.outputFile = self.incrementalOutputs[0] if len(self.incrementalOutputs) == 1 else self.incrementalOutputs
+            if self.profiler:
+                self.profiler.stop()
+            return
+
         # makes sure all the conditions match and are allowed
-        self.checkConditions()
+        with self.stage('checkConditions'):
+            self.checkConditions()
 
         if self.auc:
-            intg = Integral(
-                file=self.data,
-                y=self.y,
-                x=self.x,
-                method=self.aucm
-            )
-            intg.prettify(intg.integrate_files())
+            with self.stage('integrate'):
+                intg = Integral(
+                    file=self.files if self.stream else self.data,
+                    y=self.yPos,
+                    x=self.xPos,
+                    method=self.aucm,
+                    usecols=self.usecols,
+                    names=getattr(self, 'files', None),
+                    jobs=self.jobs if self.jobs > 0 else os.cpu_count(),
+                    chunkSize=(self.chunkSize or 100000) if self.stream else None,
+                    readArgs=getattr(self, 'readArgs', None)
+                )
+                areas = intg.integrate_files()
+            intg.prettify(areas)
+            if self.aucOutput:
+                filename = rename_file_if_conflict(self.aucOutput, True)
+                with self.stage('exportAreas'):
+                    intg.export(filename, {self.aucm: np.array(areas)}, self.aucPercentiles)
+                print(f'File {filename} saved succesfully')
+
+        elif self.stats:
+            with self.stage('stats'):
+                self.statistics = self.describeFiles()
+            print(self.statistics.to_string())
 
         # check if it is a confidence interval plot
         else:
-            # initialize the figure and ax
-            fig, ax1 = plt.subplots(facecolor=self.bgColor, constrained_layout=True)
-            if self.sd or (self.w is not None):
-                # plot the confidence interval
-                self.plotSD(self.data, self.y, ax1)
+            with self.stage('figure'):
+                plt = load_pyplot(self.displayPlot)
+                # initialize the figure and ax
+                fig, ax1 = plt.subplots(facecolor=self.bgColor, constrained_layout=True)
+            self.figure = fig
+            if self.follow is not None:
+                # the lines are kept, so the rows appended later can be added to them
+                with self.stage('plotFollow'):
+                    artists = self.drawFollowed(ax1)
+            elif self.sd or int(self.w) > 1:
+                # plot the confidence interval, or the moving average (a window of 1, the default, doesn't average)
+                with self.stage('plotSD'):
+                    self.plotSD(self.data, self.yPos, ax1)
             else:
                 # these kinds of plots below only accepts one file
                 data = self.data[0]
 
                 # call the right kind of graph
-                if self.graphType == 'line':
-                    self.plotLine(data, fig, ax1)
-                elif self.graphType == 'bar':
-                    self.plotBar(data, fig, ax1)
-                elif self.graphType == 'pie':
-                    self.plotPie(data, fig, ax1)
-                elif self.graphType == 'scatter':
-                    self.plotScatter(data, fig, ax1)
+                with self.stage('plot' + self.graphType.capitalize()):
+                    if self.graphType == 'line':
+                        self.plotLine(data, fig, ax1)
+                    elif self.graphType == 'bar':
+                        self.plotBar(data, fig, ax1)
+                    elif self.graphType == 'pie':
+                        self.plotPie(data, fig, ax1)
+                    elif self.graphType == 'scatter':
+                        self.plotScatter(data, fig, ax1)
 
             # add the extra features to the plot
-            self.ImageConfigurations(fig, ax1)
+            with self.stage('ImageConfigurations'):
+                self.ImageConfigurations(fig, ax1)
 
             # default value: shows plot, else: only saves the image
-            if self.displayPlot:
+            # a followed plot is shown while the files are followed
+            if self.displayPlot and self.follow is None:
                 plt.show()
 
             # saves the figure
             if not self.dontSave:
-                self.exportFile(self.output, self.fileName[0], fig)
+                with self.stage('exportFile'):
+                    self.outputFile = self.exportFile(self.output, self.fileName[0], fig)
+
+            if self.follow is not None:
+                self.followFiles(fig, ax1, artists)
+
+        if self.profiler:
+            self.profiler.report(self.profile if isinstance(self.profile, str) else None)
+
+    def stage(self, name):
+        """Measures a stage of the plot when profiling, otherwise does nothing"""
+        return self.profiler.stage(name) if self.profiler else NO_PROFILE
 
     def ImageConfigurations(self, fig, ax1):
         """Configures image parameters such as colors and labels"""
@@ -545,7 +2191,7 @@ class Plot:
         """
 
         # get the name of the y, x and all columns
-        columns, yColumns, xColumn = self.getAxisName(data, self.y, self.x)
+        columns, yColumns, xColumn = self.getAxisName(data, self.yPos, self.xPos)
 
         # get all the arguments
         args = self.getParameters(xColumn)
@@ -559,11 +2205,29 @@ class Plot:
         if 'marker' in args:
             args.pop('marker')
 
+        size = self.getDownsampleSize(ax1)
+        if not pd.api.types.is_numeric_dtype(data[xColumn]):
+            # pandas knows how to format dates and categories in the x-axis
+            # dates and text have no distances, so the lines are downsampled by the positions of the rows
+            positions = np.arange(len(data.index))
+            for y in yColumns:
+                # each line keeps its own points when downsampled
+                vals = data.iloc[self.downsampleIndexes(positions, data[y], size)] if size else data
+                vals.plot(kind='line', ax=ax1, y=y, marker=markers[0], color=next(colors), **args)
+                if len(markers) > 1:
+                    markers.pop(0)
+            ax1.legend()
+            return
+
+        x = data[xColumn].to_numpy(dtype=np.float64)
+        xs, ys = [], []
         for y in yColumns:
-            data.plot(kind='line', ax=ax1, y=y, marker=markers[0], color=next(colors), **args)
-            if len(markers) > 1:
-                markers.pop(0)
-        ax1.legend()
+            values = data[y].to_numpy(dtype=np.float64)
+            # each line keeps its own points when downsampled
+            indexes = self.downsampleIndexes(x, values, size) if size else slice(None)
+            xs.append(x[indexes])
+            ys.append(values[indexes])
+        self.drawLines(ax1, xColumn, xs, ys, yColumns, colors, markers, args)
 
     def plotPie(self, data, fig, ax1):
         """
@@ -571,7 +2235,7 @@ class Plot:
         """
 
         # get the name of the y, x and all columns
-        columns, yColumns, xColumn = self.getAxisName(data, self.y, self.x)
+        columns, yColumns, xColumn = self.getAxisName(data, self.yPos, self.xPos)
 
         # get all the arguments
         args = self.getParameters(xColumn, y=yColumns)
@@ -585,7 +2249,7 @@ class Plot:
         """
 
         # get the name of the y, x and all columns
-        columns, yColumns, xColumn = self.getAxisName(data, self.y, self.x)
+        columns, yColumns, xColumn = self.getAxisName(data, self.yPos, self.xPos)
 
         # get all the arguments
         args = self.getParameters(xColumn, y=yColumns)
@@ -598,11 +2262,15 @@ class Plot:
         """
 
         # get the name of the y, x and all columns
-        columns, yColumns, xColumn = self.getAxisName(data, self.y, self.x)
+        columns, yColumns, xColumn = self.getAxisName(data, self.yPos, self.xPos)
 
         # get all the arguments
         args = self.getParameters(xColumn)
 
+        if self.density:
+            self.plotDensity(data, fig, ax1, yColumns, xColumn, args)
+            return
+
         ys = yColumns.copy()
 
         symb = None
@@ -610,6 +2278,7 @@ class Plot:
 
         if not self.colors:
             color = itertools.cycle(args['colormap'].colors)
+        args.pop('colormap')
         if 'marker' in args:
             symb = args['marker']
             args['marker'] = symb[0]
@@ -632,7 +2301,81 @@ class Plot:
             i += 1
         ax1.legend(ys)
         if not self.yLabel:
-            plt.ylabel("")
+            ax1.set_ylabel("")
+
+    def plotDensity(self, data, fig, ax1, yColumns, xColumn, args):
+        """
+        Scatter plot drawn as a 2D histogram with one bin per pixel of the axes, so the cost depends on the size of the
+        figure instead of the number of points. Each y column is an image with its own colormap, and empty bins are
+        transparent so the columns can be seen over each other
+        """
+        from matplotlib.colors import LinearSegmentedColormap, LogNorm, Normalize, to_rgb
+        from matplotlib.patches import Patch
+
+        if self.colors:
+            colors = self.colors
+        else:
+            colors = itertools.cycle(args['colormap'].colors)
+        if self.densityColormap:
+            colormaps = self.densityColormap.split(',')
+            if len(colormaps) != len(yColumns):
+                message = "The number of declared colormaps is different than the number of y-axes"
+                if self.called_by_cmd:
+                    print(message)
+                    sys.exit()
+                else:
+                    raise Exception(message)
+        else:
+            # shades of the color of each column, from almost transparent to opaque
+            colormaps = [LinearSegmentedColormap.from_list('', [(*to_rgb(color), 0.25), (*to_rgb(color), 1)])
+                         for color in itertools.islice(colors, len(yColumns))]
+
+        x = data[xColumn].to_numpy(dtype=np.float64)
+        ys = data[yColumns].to_numpy(dtype=np.float64)
+
+        # the limits of the image are the given ones or the limits of the data
+        xlim = args.get('xlim', (None, None))
+        ylim = args.get('ylim', (None, None))
+        x0 = xlim[0] if xlim[0] is not None else np.nanmin(x)
+        x1 = xlim[1] if xlim[1] is not None else np.nanmax(x)
+        y0 = ylim[0] if ylim[0] is not None else np.nanmin(ys)
+        y1 = ylim[1] if ylim[1] is not None else np.nanmax(ys)
+        if x1 <= x0:
+            x1 = x0 + 1
+        if y1 <= y0:
+            y1 = y0 + 1
+
+        # one bin per pixel of the axes
+        extent = ax1.get_window_extent()
+        width, height = max(int(extent.width), 1), max(int(extent.height), 1)
+        xBins = np.floor((x - x0) * (width / (x1 - x0)))
+
+        images, handles = [], []
+        for i, y in enumerate(yColumns):
+            yBins = np.floor((ys[:, i] - y0) * (height / (y1 - y0)))
+            # the last edge belongs to the last bin, and points outside of the limits are left out
+            xb = np.where(xBins == width, width - 1, xBins)
+            yb = np.where(yBins == height, height - 1, yBins)
+            inside = (xb >= 0) & (xb < width) & (yb >= 0) & (yb < height)
+            bins = yb[inside].astype(np.int64) * width + xb[inside].astype(np.int64)
+            counts = np.bincount(bins, minlength=width * height).reshape(height, width)
+            images.append(np.ma.masked_equal(counts, 0))
+
+        vmax = max([image.max() for image in images if image.count()] or [1])
+        norm = LogNorm(vmin=1, vmax=max(vmax, 2)) if self.densityLog else Normalize(vmin=0, vmax=vmax)
+        for image, colormap, y in zip(images, colormaps, yColumns):
+            image = ax1.imshow(image, extent=(x0, x1, y0, y1), origin='lower', aspect='auto', interpolation='nearest',
+                               cmap=colormap, norm=norm)
+            handles.append(Patch(color=image.cmap(1.0), label=y))
+
+        if len(yColumns) == 1:
+            fig.colorbar(image, ax=ax1, label='Number of points')
+        ax1.legend(handles=handles)
+        ax1.set_xlabel(xColumn)
+        if 'title' in args:
+            ax1.set_title(args['title'])
+        if 'fontsize' in args:
+            ax1.tick_params(labelsize=args['fontsize'])
 
     def getParameters(self, x, y=None):
         """
@@ -730,21 +2473,155 @@ class Plot:
         Deals with file handling
         """
 
-        args = {}
+        args = {'comment': self.comment}
         # if the first row is not of labels, include it as actual data
         if not self.header:
             args['header'] = None
 
-        # if the separator is a space, make it work properly
-        if self.sep == ' ' or self.sep == '':
-            self.sep = '\ '
+        # uses the C parser unless the separator is a regular expression
+        args['sep'], args['engine'] = resolve_separator(self.sep)
+
+        # only the columns that are going to be plotted are parsed
+        args['usecols'] = sorted(set([self.x] + self.y))
+
+        filenames = self.listFiles(filenames)
+
+        if self.columnTypes:
+            args['dtype'] = self.getColumnTypes(filenames[0], args)
+
+        # the y columns are the ones that may become float32
+        floats = [args['usecols'].index(y) for y in self.y]
+
+        cache = FileCache(self.cache, self.cacheSize) if self.cache else None
+
+        if self.preflight or self.countLines:
+            self.preflightFiles(filenames, args, cache)
+
+        # when streaming, only the first file is read here, the others are read while the stats are calculated
+        self.files = filenames
+        self.readArgs = args
+        if self.stream:
+            filenames = filenames[:1]
+
+        # read all the files
+        jobs = self.jobs if self.jobs > 0 else os.cpu_count()
+        jobs = min(jobs, len(filenames))
+        try:
+            if self.stream and (self.auc or self.stats):
+                # the areas and the stats are calculated while every file is read in chunks, so only the first rows of
+                # the first file are parsed here, which are enough to check its columns and their types
+                dfs = [read_table(filenames[0], nrows=PREFLIGHT_ROWS, **args)]
+            elif self.follow is not None:
+                for fname in filenames:
+                    if detect_compression(fname):
+                        message = "The file " + fname + " is compressed, so it can't be followed"
+                        if self.called_by_cmd:
+                            print(message)
+                            sys.exit()
+                        else:
+                            raise Exception(message)
+                # followed files are read by their tails, which remember where each read stopped
+                self.tails = [FileTail(fname, self.header, self.comment) for fname in filenames]
+                dfs = [tail.parse(args) for tail in self.tails]
+                # the files without columns yet start empty, with the columns of the others (or their indexes, which
+                # are the names read_csv gives them when there is no header), and their rows are read in the next polls
+                self.followedNames = not self.header or any(df is not None for df in dfs)
+                columns = next((df.columns for df in dfs if df is not None), args['usecols'])
+                dfs = [pd.DataFrame(columns=columns) if df is None else df for df in dfs]
+            elif jobs == 1:
+                dfs = [read_data_file(fname, args, cache, self.dtype, floats) for fname in filenames]
+            else:
+                # the C parser releases the GIL, so threads are enough, while the python parser needs processes
+                # map keeps the order of the files, so the results are the same as reading them one by one
+                pool = ThreadPoolExecutor if args['engine'] == 'c' else ProcessPoolExecutor
+                with pool(max_workers=jobs) as executor:
+                    dfs = list(executor.map(read_data_file, filenames, itertools.repeat(args),
+                                            itertools.repeat(cache), itertools.repeat(self.dtype),
+                                            itertools.repeat(floats)))
+        except ValueError as e:
+            # pandas complains about the usecols when the file has less columns than the indexes given
+            if 'usecols' not in str(e).lower():
+                raise
+            message = "The selected columns weren't found in the files. Check the column indexes and the separator"
+            if self.called_by_cmd:
+                print(message)
+                sys.exit()
+            else:
+                raise Exception(message)
+
+        # the positions of the columns among the ones that were read, the indexes are kept for the next reads
+        self.usecols = args['usecols']
+        self.xPos = self.usecols.index(self.x)
+        self.yPos = [self.usecols.index(y) for y in self.y]
+
+        return dfs
+
+    def preflightFiles(self, filenames, args, cache=None):
+        """
+        Checks the files before they are parsed, reading only their headers and first rows, so the errors checkConditions
+        would find after parsing every file are found right away. With countLines, the lines of the files are counted
+        too, which reads every byte of them. The parser may count the rows differently (quoted newlines, lines of
+        spaces), so files with different numbers of lines are only reported, and checkConditions compares their rows
+        after parsing. The files in the cache aren't parsed, so they aren't checked either
+        """
+        if cache is not None:
+            filenames = [fname for fname in filenames if not cache.has(cache.key(fname, args, self.dtype))]
+
+        message = None
+        # the lines may be counted without checking the columns
+        for fname in filenames if self.preflight else []:
+            try:
+                sample = read_table(fname, nrows=PREFLIGHT_ROWS, **{key: value for key, value in args.items()
+                                                                    if key != 'usecols'})
+            except pd.errors.EmptyDataError:
+                # a followed file may have nothing to parse yet
+                if self.follow is not None:
+                    continue
+                raise
+            if len(sample.columns) == 1:
+                message = "The file " + fname + " can't be parsed by the current separator"
+            elif args['usecols'][-1] >= len(sample.columns):
+                message = ("The selected columns weren't found in the file " + fname + ", which has " +
+                           str(len(sample.columns)) + " columns. Check the column indexes and the separator")
+            else:
+                # followed files may not have rows yet
+                for y in self.y:
+                    if len(sample.index) and not pd.api.types.is_numeric_dtype(sample.iloc[:, y]):
+                        message = "Invalid data type for column '" + str(sample.columns[y]) + "' of " + fname
+                        break
+            if message:
+                if self.called_by_cmd:
+                    print(message)
+                    sys.exit()
+                else:
+                    raise Exception(message)
+
+        # the same rows checkConditions compares, while the compressed files can only be counted by decompressing them
+        if self.countLines and len(filenames) > 1 and not self.stats and self.follow is None and not self.align:
+            rows = {}
+            for fname in filenames:
+                if not detect_compression(fname):
+                    rows[fname] = count_rows(fname, self.header, self.comment)
+            if len(set(rows.values())) > 1:
+                first = next(iter(rows))
+                other = next(fname for fname in rows if rows[fname] != rows[first])
+                message = ("The files that were given may have different numbers of rows (" + first + " has " +
+                           str(rows[first]) + " lines of data, " + other + " has " + str(rows[other]) +
+                           "), which is checked again after they are parsed")
+                if self.called_by_cmd:
+                    print(message)
+                else:
+                    warnings.warn(message)
 
+    def listFiles(self, filenames):
+        """Replaces the directories by their files and makes sure all the files exist"""
         # if it a directory is passed as the -f argument
         # store all the csv files in them to afterwards open them
         tmp_f = []
         for fs in filenames:
             if os.path.isdir(fs):
-                tmp_f.extend([f'{fs}/{f}' for f in os.listdir(fs) if self.extension in f])
+                # compressed files count as files of their extension, e.g. data.csv.gz as a .csv
+                tmp_f.extend([f'{fs}/{f}' for f in os.listdir(fs) if has_extension(f, self.extension)])
             else:
                 tmp_f.append(fs)
         filenames = tmp_f
@@ -752,8 +2629,6 @@ class Plot:
         # make sure there are files to read
         assert len(filenames) > 0, "At least one file should be passed"
 
-        # read all the files
-        dfs = []
         for fname in filenames:
             if not os.path.exists(fname):
                 message = "The file " + fname + " doesn't exist"
@@ -762,14 +2637,74 @@ class Plot:
                     sys.exit()
                 else:
                     raise Exception(message)
-            dfs.append(pd.read_csv(fname, sep=self.sep, comment=self.comment, engine='python', **args))
 
-        return dfs
+        return filenames
+
+    def checkIncremental(self, data=None):
+        """
+        Calculates the fingerprint of the plot, from its options and its files (or its data, if it was given), and tells
+        if all the outputs were made with the same fingerprint. The areas under the curves and the stats are only
+        printed, so they are always calculated
+        """
+        if self.auc or self.stats or self.dontSave or self.follow is not None:
+            return False
+
+        digest = hashlib.sha1()
+        options = {name: getattr(self, name, None) for name in RENDER_OPTIONS}
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        # a new version of plotme may draw the same plot differently
+        code = os.stat(__file__)
+        digest.update(f'{code.st_size} {code.st_mtime_ns}'.encode())
+
+        if data is not None:
+            for df in (data if isinstance(data, list) else [data]):
+                digest.update(json.dumps([str(column) for column in df.columns]).encode())
+                digest.update(pd.util.hash_pandas_object(df).to_numpy().tobytes())
+        else:
+            for fname in self.listFiles(self.fileName):
+                if self.incremental == 'hash':
+                    with open(fname, 'rb') as f:
+                        for block in iter(lambda: f.read(1 << 20), b''):
+                            digest.update(block)
+                else:
+                    info = os.stat(fname)
+                    digest.update(f'{os.path.abspath(fname)} {info.st_size} {info.st_mtime_ns}'.encode())
+        self.fingerprint = digest.hexdigest()
+
+        self.incrementalOutputs = [self.outputName(outName.strip(), self.fileName[0])[0]
+                                   for outName in self.output.split(',')]
+        for filename in self.incrementalOutputs:
+            try:
+                with open(filename + FINGERPRINT) as f:
+                    if f.read().strip() != self.fingerprint or not os.path.exists(filename):
+                        return False
+            except OSError:
+                return False
+        return True
+
+    def getColumnTypes(self, fname, args):
+        """
+        Converts the keys of the columnTypes dictionary, which can be column indexes (starting in 1) or names, to the
+        labels pandas uses for the columns of the file
+        """
+        if self.header:
+            names = read_table(fname, nrows=0, sep=args['sep'], engine=args['engine'], comment=self.comment).columns
+        else:
+            names = None
+
+        dtypes = {}
+        for key, dtype in self.columnTypes.items():
+            if isinstance(key, numbers.Integral):
+                key = names[key - 1] if names is not None else key - 1
+            dtypes[key] = dtype
+        return dtypes
 
     def getPalette(self):
         '''
         deep, muted, pastel, bright, dark, and colorblind
         '''
+        import seaborn as sns
+        from matplotlib.colors import ListedColormap
         return ListedColormap(sns.color_palette(self.Palette))
 
     def defineAxis(self, y):
@@ -809,7 +2744,99 @@ class Plot:
 
     def exportFile(self, outName, fName, fig):
         """
-        Function responsible for saving the plot(s)
+        Function responsible for saving the plot(s). Several outputs can be given separated by commas, in which case
+        the figure is drawn once and saved to all of them, returning the list of files that were saved
+        """
+        if ',' in outName:
+            return self.exportFiles(outName.split(','), fName, fig)
+
+        filename, ask = self.resolveOutput(*self.outputName(outName, fName))
+        if ask and not ask_to_replace(filename):
+            sys.exit()
+        save_figure(fig, filename)
+        self.saveFingerprint([filename])
+        print(f'File {filename} saved succesfully')
+        return filename
+
+    def resolveOutput(self, name, output_contains_name):
+        """
+        Final name of an output and whether the user has to be asked before replacing it. Incremental plots keep the
+        same name in every run and replace their own outputs, which are the ones with a fingerprint next to them
+        """
+        if getattr(self, 'incremental', False):
+            return name, os.path.exists(name) and not os.path.exists(name + FINGERPRINT)
+        if output_contains_name:
+            return name, os.path.exists(name)
+        return rename_file_if_conflict(name, False), False
+
+    def saveFingerprint(self, filenames):
+        if not getattr(self, 'fingerprint', None):
+            return
+        for filename in filenames:
+            with open(filename + FINGERPRINT, 'w') as f:
+                f.write(self.fingerprint)
+
+    def exportFiles(self, outNames, fName, fig):
+        """
+        Saves the figure to several outputs. The outputs that don't have to ask before replacing a file are saved first,
+        by other processes with their own copies of the figure, while the questions about the other ones are answered.
+        Answering no only skips that output. If the figure can't be pickled, the outputs are saved one at a time
+        """
+        targets = []
+        for outName in outNames:
+            target = self.outputName(outName.strip(), fName)
+            if target not in targets:
+                targets.append(target)
+
+        resolved = [self.resolveOutput(name, contains) for name, contains in targets]
+        ready = [name for name, ask in resolved if not ask]
+        conflicts = [name for name, ask in resolved if ask]
+
+        # with a single core, the copies of the figure would only compete with this process
+        try:
+            figure = pickle.dumps(fig) if len(targets) > 1 and (os.cpu_count() or 1) > 1 else None
+        except Exception:
+            figure = None
+        executor = None
+        if figure is not None:
+            executor = ProcessPoolExecutor(max_workers=min(len(targets) - 1, os.cpu_count() or 1),
+                                           initializer=load_pyplot)
+
+        # this process saves one of the outputs itself, the other ones go to the workers
+        local, futures = [], []
+
+        def save(filename):
+            if executor is None or not local:
+                local.append(filename)
+            else:
+                futures.append(executor.submit(save_pickled_figure, figure, filename))
+
+        for filename in ready:
+            save(filename)
+        for filename in conflicts:
+            if ask_to_replace(filename):
+                save(filename)
+
+        saved = []
+        try:
+            for filename in local:
+                save_figure(fig, filename)
+                saved.append(filename)
+            for future in futures:
+                saved.append(future.result())
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        self.saveFingerprint(saved)
+        for filename in saved:
+            print(f'File {filename} saved succesfully')
+        return saved
+
+    def outputName(self, outName, fName):
+        """
+        Name of the output file, made from the output argument and the name of the data file. Returns it and whether
+        the name was chosen by the user, in which case it is replaced if it exists instead of getting a number
         """
 
         # defines regex`s that search specific combinations
@@ -865,9 +2892,7 @@ class Plot:
 
             # search if given extension is supported
             if re.search("^(eps|jpeg|jpg|pdf|pgf|png|ps|raw|rgba|svg|svgz|tif|tiff)$", ext):
-                filename = rename_file_if_conflict(newName + add + ext, output_contains_name)
-                fig.savefig(filename, bbox_inches="tight", facecolor=fig.get_facecolor(), transparent=True)
-                print(f'File {filename} saved succesfully')
+                return newName + add + ext, output_contains_name
             else:
                 raise NameError("Extension not supported")
 
@@ -882,9 +2907,7 @@ class Plot:
                     rmvName = rmvName[:-1]
                 if rmvName != '':
                     fName = rmvName
-            filename = rename_file_if_conflict(fName + 'Plot' + outName, output_contains_name)
-            fig.savefig(filename, bbox_inches="tight", facecolor=fig.get_facecolor(), transparent=True)
-            print(f'File {filename} saved succesfully')
+            return fName + 'Plot' + outName, output_contains_name
 
 
 class Integral:
@@ -892,7 +2915,8 @@ class Integral:
     This function executes complex calculations like area under curve.
     """
 
-    def __init__(self, file=None, y=1, x=0, method='simpson', cmd=False) -> None:
+    def __init__(self, file=None, y=1, x=0, method='simpson', usecols=None, names=None, jobs=1, chunkSize=None,
+                 readArgs=None, cmd=False) -> None:
         if cmd:
             self.prs = argparse.ArgumentParser(
                 description='Integrate Module - For calculating the area under the curve.')
@@ -906,20 +2930,47 @@ class Integral:
             self.prs.add_argument('-m', '--method', action='store', choices=['simpson', 'trapz', 'mean'],
                                   default='simpson',
                                   help='The method that is goind to be used for the calculation. It can be the simpson rule or the trapezoidal rule.')
+            self.prs.add_argument('-j', '--jobs', type=int, default=1,
+                                  help='Number of processes the files are split among.')
+            self.prs.add_argument('-c', '--chunkSize', type=int, default=None,
+                                  help='Reads the files in chunks of this number of rows, so files larger than the memory can be integrated.')
+            self.prs.add_argument('-o', '--output', type=str, default=None,
+                                  help='File (csv, json or npz) where the areas and their statistics across the files are saved.')
+            self.prs.add_argument('-p', '--percentiles', nargs='+', type=float, default=list(AUC_PERCENTILES),
+                                  help='Percentiles of the areas across the files that are saved in the output file.')
             # parse
             self.args = self.prs.parse_args()
 
-            self.files = self.open_files(self.args.files)
             self.y = self._convert_human_indexing(self.args.yAxis)
             self.x = self._convert_human_indexing(self.args.xAxis)
+            self.usecols = None
+            self.xPos, self.yPos = self.x, self.y
+            self.chunkSize = self.args.chunkSize
+            self.readArgs = {}
+            if self.chunkSize:
+                # the files are only read while they are integrated
+                self.files = self.args.files
+                self._project_columns()
+            else:
+                self.files = self.open_files(self.args.files)
             self.method = self.args.method
+            self.names = None
+            self.jobs = self.args.jobs
         else:
             # if the software is being used as a module
             self.files = file if isinstance(file, list) else [file]
             self.y = y if isinstance(y, list) else [y]
-            self.y = self.y
             self.x = x
+            # positions of the columns in the files, the same as the indexes until the columns are projected
+            self.xPos, self.yPos = self.x, self.y
+            # original indexes of the columns, when the files were read with only some of them
+            self.usecols = usecols
             self.method = method
+            self.names = names
+            self.jobs = jobs
+            # when a chunk size is given, the files are paths that are read with readArgs while they are integrated
+            self.chunkSize = chunkSize
+            self.readArgs = readArgs if readArgs is not None else {}
 
     def _convert_human_indexing(self, val):
         if isinstance(val, int):
@@ -940,62 +2991,392 @@ class Integral:
 
     def open_files(self, files):
         handlers = []
+        # only the x and y columns are parsed
+        usecols = self._project_columns()
         # stores all the dataframes in handlers array
         for fs in files:
-            handlers.append(pd.read_csv(fs))
+            handlers.append(read_table(fs, usecols=usecols))
 
         return handlers
 
-    def _calculate(self, file, y, x):
-        # sets the arguments
-        args = {
-            'y': file[file.columns[y]] * 5,
-            'x': file[file.columns[x]]
-        }
-        # the result is calculated using the method chosen before
-        if self.method == 'simpson':
-            return simps(**args)
-        elif self.method == 'trapz':
-            return trapz(**args)
+    def _project_columns(self):
+        usecols = sorted(set([self.x] + self.y))
+        self.readArgs['usecols'] = usecols
+        # the positions of the columns among the ones that were read, the indexes are kept for the next reads
+        self.usecols = usecols
+        self.xPos = usecols.index(self.x)
+        self.yPos = [usecols.index(y) for y in self.y]
+        return usecols
+
+    def _human_index(self, val):
+        # the files may have been read with only some of their columns
+        if self.usecols is not None:
+            val = self.usecols[val]
+        return val + 1
+
+    def _stack(self):
+        """
+        Groups the files by their number of rows and stacks the selected columns of each group, so every group is
+        integrated at once. Returns the indexes of the files of each group, their x (files x rows) and their y (files x
+        rows x columns)
+        """
+        groups = {}
+        for i, file in enumerate(self.files):
+            groups.setdefault(len(file.index), []).append(i)
+
+        for rows, indexes in groups.items():
+            xs = np.empty((len(indexes), rows))
+            ys = np.empty((len(indexes), rows, len(self.yPos)))
+            for k, i in enumerate(indexes):
+                xs[k] = self.files[i].iloc[:, self.xPos].to_numpy(dtype=np.float64)
+                ys[k] = self.files[i].iloc[:, self.yPos].to_numpy(dtype=np.float64)
+            yield indexes, xs, ys
+
+    def integrate(self, methods=None):
+        """
+        Calculates the areas of every file and y column for each one of the methods (the chosen one by default).
+        Returns a dictionary with an array of files x columns for each method
+        """
+        methods = methods or [self.method]
+        if self.chunkSize:
+            return self._integrate_stream(methods)
+        areas = {method: np.empty((len(self.files), len(self.y))) for method in methods}
+
+        blocks = []
+        for indexes, xs, ys in self._stack():
+            # the files of a group can also be split among the workers of a process pool
+            parts = max(min(self.jobs, len(indexes)), 1)
+            for part in np.array_split(np.arange(len(indexes)), parts):
+                blocks.append(([indexes[i] for i in part], xs[part], ys[part]))
+
+        if self.jobs > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+                results = executor.map(integrate_block, [block[1] for block in blocks], [block[2] for block in blocks],
+                                       itertools.repeat(methods))
+                results = list(results)
+        else:
+            results = [integrate_block(block[1], block[2], methods) for block in blocks]
+
+        for (indexes, _, _), result in zip(blocks, results):
+            for method in methods:
+                # the y columns are multiplied by 5 before the integration, which is the same as scaling the areas
+                areas[method][indexes] = result[method] * 5
+
+        return areas
+
+    def _integrate_stream(self, methods):
+        """Integrates each file reading chunkSize rows at a time"""
+        args = (itertools.repeat(self.readArgs), itertools.repeat(int(self.chunkSize)), itertools.repeat(self.xPos),
+                itertools.repeat(self.yPos), itertools.repeat(methods))
+        if self.jobs > 1 and len(self.files) > 1:
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(self.files))) as executor:
+                results = list(executor.map(integrate_stream, self.files, *args))
         else:
-            return (simps(**args) + trapz(**args)) / 2
+            results = list(map(integrate_stream, self.files, *args))
+
+        # the y columns are multiplied by 5 before the integration, which is the same as scaling the areas
+        return {method: np.array([result[method] for result in results]) * 5 for method in methods}
 
     def integrate_files(self):
-        file_areas = []
-        # for every file, calculate the area and store in the file_areas array, to be returned afterwards
-        for file in self.files:
-            area = []
-            for y in self.y:
-                # calculate the result
-                result = self._calculate(file, y, self.x)
-                # check if the result is nan, if so, raise an exception
-                if np.isnan(result):
-                    raise ValueError('Some column have unsuported values to calculate the Area Under the Curve.')
-                # otherwise, append the result
-                area.append(result)
-
-            file_areas.append(area[:])
-            area.clear()
-
-        return file_areas
-
-    def stats(self):
-        # return the pandas description
-        for file in self.files:
-            return file.describe()
+        areas = self.integrate()[self.method]
+        # check if some result is nan, if so, raise an exception
+        if np.isnan(areas).any():
+            raise ValueError('Some column have unsuported values to calculate the Area Under the Curve.')
 
-    def prettify(self, int_arrs):
+        return areas.tolist()
+
+    def integrate_table(self, methods=None, areas=None):
+        """
+        Areas of every file, column and method as a tidy table, with one row per area
+        """
+        if areas is None:
+            areas = self.integrate(methods)
+        names = self._file_names()
+        columns = self._column_names()
+        table = []
+        for method, values in areas.items():
+            table.append(pd.DataFrame({
+                'file': np.repeat(names, len(self.yPos)),
+                'column': np.tile(columns, len(self.files)),
+                'index': np.tile([self._human_index(y) for y in self.yPos], len(self.files)),
+                'method': method,
+                'area': values.ravel()
+            }))
+        return pd.concat(table, ignore_index=True)
+
+    def summary(self, areas=None, percentiles=AUC_PERCENTILES):
+        """
+        Statistics of the areas across the files, with one row for each column and method
+        """
+        if areas is None:
+            areas = self.integrate()
+        columns = self._column_names()
+        table = []
+        for method, values in areas.items():
+            stats = summarize_areas(values, percentiles)
+            table.append(pd.DataFrame({
+                'column': columns,
+                'index': [self._human_index(y) for y in self.yPos],
+                'method': method,
+                **stats
+            }))
+        return pd.concat(table, ignore_index=True)
+
+    def export(self, filename, areas=None, percentiles=AUC_PERCENTILES):
+        """
+        Saves the areas of every file and column and their statistics across the files. The format is chosen by the
+        extension of the filename: .csv (the summary goes to a second file ending in _summary.csv), .json or .npz
+        """
+        if areas is None:
+            areas = self.integrate()
+        extension = filename[filename.rfind('.'):].lower() if '.' in filename else ''
+        if extension not in ('.csv', '.json', '.npz'):
+            raise ValueError(f'Unsupported format for the areas: {filename}. Use .csv, .json or .npz')
+
+        names = [str(name) for name in self._file_names()]
+        columns = [str(column) for column in self._column_names()]
+        indexes = [self._human_index(y) for y in self.yPos]
+
+        if extension == '.csv':
+            self.integrate_table(areas=areas).to_csv(filename, index=False)
+            self.summary(areas, percentiles).to_csv(filename[:filename.rfind('.')] + '_summary.csv', index=False)
+        elif extension == '.json':
+            def values(array):
+                # NaN isn't valid JSON
+                return [[None if np.isnan(v) else v for v in row] for row in np.atleast_2d(array).tolist()]
+
+            result = {
+                'files': names,
+                'columns': columns,
+                'indexes': indexes,
+                'areas': {method: values(array) for method, array in areas.items()},
+                'summary': {method: {stat: values(array)[0] for stat, array in summarize_areas(array, percentiles).items()}
+                            for method, array in areas.items()}
+            }
+            with open(filename, 'w') as f:
+                json.dump(result, f, indent=4)
+        else:
+            arrays = {'files': np.array(names), 'columns': np.array(columns), 'indexes': np.array(indexes)}
+            for method, array in areas.items():
+                arrays[f'areas_{method}'] = array
+                for stat, value in summarize_areas(array, percentiles).items():
+                    arrays[f'{stat}_{method}'] = value
+            np.savez(filename, **arrays)
+
+        return filename
+
+    def _column_names(self):
+        first = self.files[0]
+        if self.chunkSize:
+            first = read_table(first, nrows=0, **self.readArgs)
+        return [first.columns[y] for y in self.yPos]
+
+    def _file_names(self):
+        if self.names is not None:
+            return list(self.names)
         try:
-            fname = self.args.files
-        except:
-            fname = [f'File {str(i)}' for i in range(len(self.files))]
+            return list(self.args.files)
+        except AttributeError:
+            return [f'File {str(i)}' for i in range(len(self.files))]
+
+    def stats(self, percentiles=STATS_PERCENTILES):
+        """
+        Statistics of the y columns over all the rows of all the files, in the layout of pandas describe. The files
+        are added one at a time (one chunk at a time when a chunk size was given)
+        """
+        if self.chunkSize:
+            stats = None
+            for fs in self.files:
+                result = describe_file(fs, self.readArgs, int(self.chunkSize), self.yPos)
+                stats = result if stats is None else stats.merge(result)
+        else:
+            stats = ColumnStats(len(self.y))
+            for file in self.files:
+                stats.update(file.iloc[:, self.yPos].to_numpy(dtype=np.float64))
+
+        return stats.describe(self._column_names(), [p / 100 for p in percentiles])
+
+    def prettify(self, int_arrs):
+        fname = self._file_names()
         print('Area Under Curve:')
-        for j, y in enumerate(self.y):
-            scientific_notation = "{:e}".format(int_arrs[0][j])
-            print(f'Y[{y + 1}]: {scientific_notation}')
+        for i, file in enumerate(fname):
+            if len(fname) > 1:
+                print(f'\n{f"VALUES FOR {file}":^30}')
+            for j, y in enumerate(self.yPos):
+                scientific_notation = "{:e}".format(int_arrs[i][j])
+                print(f'Y[{self._human_index(y)}]: {scientific_notation}')
+
+        # with several files, the distribution of the areas is shown as well
+        if len(fname) > 1:
+            stats = summarize_areas(np.asarray(int_arrs, dtype=np.float64), ())
+            print(f'\n{f"SUMMARY OF {len(fname)} FILES":^30}')
+            for j, y in enumerate(self.yPos):
+                print(f'Y[{self._human_index(y)}]: mean {stats["mean"][j]:e}, std {stats["std"][j]:e}, '
+                      f'min {stats["min"][j]:e}, max {stats["max"][j]:e}')
+
+
+def summarize_areas(areas, percentiles=AUC_PERCENTILES):
+    """
+    Statistics of the areas of several files (files x columns) for each column, computed over all the columns at once.
+    Returns a dictionary with an array (one value per column) for each statistic
+    """
+    areas = np.atleast_2d(areas)
+    stats = {
+        'count': np.full(areas.shape[1], areas.shape[0]),
+        'mean': areas.mean(axis=0),
+        # the sample standard deviation, like the one of the plots
+        'std': areas.std(axis=0, ddof=1) if areas.shape[0] > 1 else np.zeros(areas.shape[1]),
+        'min': areas.min(axis=0),
+        'max': areas.max(axis=0)
+    }
+    if len(percentiles):
+        for p, values in zip(percentiles, np.percentile(areas, percentiles, axis=0)):
+            stats[f'p{p:g}'] = values
+    return stats
+
+
+def simpson_pairs(x, y):
+    """
+    Composite Simpson's rule over the pairs of intervals of x (rows) and y (rows x columns), which must have an odd number
+    of rows. The weights are the ones scipy uses for irregularly spaced points
+    """
+    h = np.diff(x)
+    h0, h1 = h[0::2], h[1::2]
+    hsum, hprod = h0 + h1, h0 * h1
+    h0divh1 = np.divide(h0, h1, out=np.zeros_like(h0), where=h1 != 0)
+    first = 2.0 - np.divide(1.0, h0divh1, out=np.zeros_like(h0divh1), where=h0divh1 != 0)
+    middle = hsum * np.divide(hsum, hprod, out=np.zeros_like(hsum), where=hprod != 0)
+    last = 2.0 - h0divh1
+    return (hsum / 6.0 * first) @ y[0:-1:2] + (hsum / 6.0 * middle) @ y[1::2] + (hsum / 6.0 * last) @ y[2::2]
 
 
-if __name__ == "__main__":
-    instance = Plot(cmd=True)
-    sns.set()
+class RunningArea:
+    """
+    Area under several curves that share the same x, added one chunk of rows at a time. Only the rows that weren't used
+    yet are carried to the next chunk, so the memory doesn't depend on the length of the file.
+
+    Simpson's rule is summed over the pairs of intervals starting at the even rows and, separately, at the odd rows.
+    With an even number of rows, the last interval is handled like scipy does: with Cartwright's correction since scipy
+    1.11, or with the average of the two other sums before it
+    """
+    def __init__(self, columns):
+        self.count = 0
+        self.trapz = np.zeros(columns)
+        self.simpson = [np.zeros(columns), np.zeros(columns)]
+        self.pending = [(np.empty(0), np.empty((0, columns))), (np.empty(0), np.empty((0, columns)))]
+        self.head = (np.empty(0), np.empty((0, columns)))
+        self.tail = (np.empty(0), np.empty((0, columns)))
+
+    def update(self, x, y):
+        if len(x) == 0:
+            return
+
+        # the trapezoids between the last row of the previous chunk and the rows of this one
+        tx, ty = np.concatenate((self.tail[0][-1:], x)), np.concatenate((self.tail[1][-1:], y))
+        self.trapz += (np.diff(tx) / 2) @ (ty[1:] + ty[:-1])
+
+        for phase in (0, 1):
+            px, py = np.concatenate((self.pending[phase][0], x)), np.concatenate((self.pending[phase][1], y))
+            # the odd pairs start at the second row of the file
+            if phase == 1 and self.count == 0:
+                px, py = px[1:], py[1:]
+            pairs = (len(px) - 1) // 2
+            if pairs > 0:
+                self.simpson[phase] += simpson_pairs(px[:2 * pairs + 1], py[:2 * pairs + 1])
+                px, py = px[2 * pairs:], py[2 * pairs:]
+            self.pending[phase] = (px, py)
+
+        self.head = tuple(np.concatenate((old, new))[:2] for old, new in zip(self.head, (x, y)))
+        self.tail = tuple(np.concatenate((old, new))[-3:] for old, new in zip(self.tail, (x, y)))
+        self.count += len(x)
+
+    def getTrapz(self):
+        return self.trapz
+
+    def getSimpson(self):
+        if self.count < 3:
+            return self.trapz
+        if self.count % 2:
+            return self.simpson[0]
+
+        (x0, x1, x2), y = self.tail
+        lastInterval = (x2 - x1) * (y[2] + y[1]) / 2
+        if simpson_even_rule() == 'simpson':
+            # Cartwright's correction for the last interval
+            h0, h1 = x1 - x0, x2 - x1
+            alpha = (2 * h1 ** 2 + 3 * h0 * h1) / (6 * (h1 + h0)) if h1 + h0 != 0 else 0
+            beta = (h1 ** 2 + 3.0 * h0 * h1) / (6 * h0) if h0 != 0 else 0
+            eta = h1 ** 3 / (6 * h0 * (h0 + h1)) if h0 * (h0 + h1) != 0 else 0
+            return self.simpson[0] + alpha * y[2] + beta * y[1] - eta * y[0]
+
+        (hx0, hx1), hy = self.head
+        firstInterval = (hx1 - hx0) * (hy[1] + hy[0]) / 2
+        return (self.simpson[0] + lastInterval + firstInterval + self.simpson[1]) / 2
+
+    def getArea(self, method):
+        if method == 'simpson':
+            return self.getSimpson()
+        if method == 'trapz':
+            return self.getTrapz()
+        return (self.getSimpson() + self.getTrapz()) / 2
+
+
+def simpson_even_rule():
+    """How the installed scipy handles the last interval of Simpson's rule when the number of points is even"""
+    import scipy
+    version = tuple(int(number) for number in re.findall(r'\d+', scipy.__version__)[:2])
+    return 'simpson' if version >= (1, 11) else 'avg'
+
+
+def integrate_stream(fname, args, chunkSize, x, y, methods):
+    """
+    Areas under the curves of a file that is read in chunks of rows. Returns a dictionary with an array of areas
+    (one per y column) for each method. It is kept at module level so it can be sent to the workers of a process pool
+    """
+    area = RunningArea(len(y))
+    for chunk in read_table(fname, chunksize=chunkSize, **args):
+        area.update(chunk.iloc[:, x].to_numpy(dtype=np.float64), chunk.iloc[:, y].to_numpy(dtype=np.float64))
+    return {method: area.getArea(method) for method in methods}
+
+
+def integrate_block(x, y, methods):
+    """
+    Areas under the curves of a block of files with the same number of rows, in a single call per method. y is an
+    array of files x rows x columns and x of files x rows. Returns a dictionary of arrays of files x columns. It is kept
+    at module level so it can be sent to the workers of a process pool
+    """
+    try:
+        from scipy.integrate import simpson, trapezoid
+    except ImportError:
+        from scipy.integrate import simps as simpson, trapz as trapezoid
+
+    # when every file has the same x, which is the usual case, the spacing is calculated only once
+    if (x == x[0]).all():
+        x = x[0]
+    else:
+        x = np.broadcast_to(x[:, :, None], y.shape)
+    areas = {}
+    if 'simpson' in methods or 'mean' in methods:
+        areas['simpson'] = simpson(y, x=x, axis=1)
+    if 'trapz' in methods or 'mean' in methods:
+        areas['trapz'] = trapezoid(y, x=x, axis=1)
+    if 'mean' in methods:
+        areas['mean'] = (areas['simpson'] + areas['trapz']) / 2
+    return {method: areas[method] for method in methods}
+
+
+def main(argv=None):
+    """Makes the plot of the command line arguments, or of the given list of arguments"""
+    instance = Plot(cmd=True, argv=argv)
+    # the style is only needed when there is something to draw
+    if not instance.auc and not instance.stats and not instance.upToDate:
+        # measured on its own, so the memory of the imports isn't counted in the first stage of the plot
+        with instance.stage('loadPyplot'):
+            load_pyplot(instance.displayPlot)
+            import seaborn as sns
+            sns.set()
     instance.plotControl()
+
+
+if __name__ == "__main__":
+    main()
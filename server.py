@@ -0,0 +1,175 @@
+import os
+# the server never opens windows, so the GUI backends aren't even probed
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+import argparse
+import contextlib
+import io
+import json
+import mimetypes
+import socketserver
+import sys
+import threading
+import traceback
+
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import matplotlib.pyplot as plt
+
+import plotme
+
+
+def warm_up():
+    """
+    Runs once in every worker, so the styles, the palettes and the fonts are loaded before the first request arrives
+    """
+    # a named output that already exists can't be confirmed by anyone, so the question gets an EOF instead of waiting
+    sys.stdin = io.StringIO()
+    import seaborn as sns
+    sns.set()
+    fig, ax = plt.subplots(constrained_layout=True)
+    ax.plot([0, 1], [0, 1], label='warm up')
+    ax.legend()
+    ax.set_title('warm up')
+    fig.savefig(io.BytesIO(), format='png')
+    fig.savefig(io.BytesIO(), format='pdf')
+    plt.close('all')
+
+
+def render(params):
+    """
+    Makes a plot in a worker. The parameters are the ones of the Plot constructor, besides 'return', which can be
+    'path' (the default) to save the file and return its name or 'bytes' to return the image itself, in the format
+    given by 'format' or by the extension of 'output'
+    """
+    params = dict(params)
+    mode = params.pop('return', 'path')
+    fmt = params.pop('format', None)
+    if mode == 'bytes':
+        params['dontSave'] = True
+        if fmt is None:
+            output = params.get('output', '.png')
+            fmt = output[output.rfind('.') + 1:] if '.' in output else 'png'
+
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            plot = plotme.Plot(**params)
+            plot.plotControl()
+
+        if mode == 'bytes':
+            if not hasattr(plot, 'figure'):
+                return {'log': log.getvalue()}, None, None
+            image = io.BytesIO()
+            plot.figure.savefig(image, format=fmt, bbox_inches="tight", facecolor=plot.figure.get_facecolor(),
+                                transparent=True)
+            return None, image.getvalue(), fmt
+        return {'output': getattr(plot, 'outputFile', None), 'log': log.getvalue()}, None, None
+    except EOFError:
+        return {'error': 'The output file already exists', 'log': log.getvalue()}, None, None
+    except Exception as e:
+        error = ''.join(traceback.format_exception_only(type(e), e)).strip()
+        return {'error': error, 'log': log.getvalue()}, None, None
+    finally:
+        plt.close('all')
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    POST /plot with a JSON body makes a plot, GET /health tells if the server is up and how many jobs are pending
+    """
+    def address_string(self):
+        # UNIX sockets don't have a client address
+        return str(self.client_address[0]) if self.client_address else 'local'
+
+    def reply(self, status, body, contentType='application/json'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', contentType)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self.reply(404, {'error': 'Not found'})
+            return
+        self.reply(200, {'status': 'ok', 'pending': self.server.pending})
+
+    def do_POST(self):
+        if self.path != '/plot':
+            self.reply(404, {'error': 'Not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            params = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(params, dict):
+                raise ValueError('The body must be a JSON object')
+        except ValueError as e:
+            self.reply(400, {'error': str(e)})
+            return
+
+        # the queue is bounded, so a burst of requests doesn't pile up forever
+        if not self.server.slots.acquire(blocking=False):
+            self.reply(503, {'error': 'The server is busy, try again later'})
+            return
+        try:
+            with self.server.lock:
+                self.server.pending += 1
+            result, image, fmt = self.server.executor.submit(render, params).result()
+        finally:
+            with self.server.lock:
+                self.server.pending -= 1
+            self.server.slots.release()
+
+        if image is not None:
+            self.reply(200, image, mimetypes.guess_type('plot.' + fmt)[0] or 'application/octet-stream')
+        elif 'error' in result:
+            self.reply(400, result)
+        else:
+            self.reply(200, result)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+if __name__ == '__main__':
+    prs = argparse.ArgumentParser(description='Server Module - Keeps plotme loaded and makes plots on request.')
+    prs.add_argument('-p', '--port', type=int, default=8765, help='Port of the server, which only listens on localhost.')
+    prs.add_argument('-s', '--socket', type=str, default=None,
+                     help='Path of a UNIX socket to listen on, instead of the port.')
+    prs.add_argument('-w', '--workers', type=int, default=2, help='Number of processes making the plots.')
+    prs.add_argument('-q', '--queue', type=int, default=16,
+                     help='Number of requests that can wait for a worker before the server answers that it is busy.')
+    args = prs.parse_args()
+
+    if args.socket:
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+        server = UnixHTTPServer(args.socket, Handler)
+        address = args.socket
+    else:
+        server = ThreadingHTTPServer(('127.0.0.1', args.port), Handler)
+        address = f'http://127.0.0.1:{args.port}'
+
+    server.executor = ProcessPoolExecutor(max_workers=args.workers, initializer=warm_up)
+    # starts the workers right away, instead of on the first request
+    for _ in range(args.workers):
+        server.executor.submit(int)
+    server.slots = threading.BoundedSemaphore(args.workers + args.queue)
+    server.pending = 0
+    server.lock = threading.Lock()
+
+    print(f'Serving on {address}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.executor.shutdown()
+        if args.socket:
+            os.remove(args.socket)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# the tests only save figures, so the GUI backends aren't even probed
+os.environ.setdefault('MPLBACKEND', 'Agg')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
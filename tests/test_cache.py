@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import plotme
+
+
+def test_text_and_categorical_columns_are_cached(tmp_path):
+    cache = plotme.FileCache(str(tmp_path))
+    df = pd.DataFrame({
+        'value': [1.0, 2.0, 3.0],
+        'name': ['a', np.nan, ''],
+        'group': pd.Categorical(['x', 'y', 'x']),
+        'level': pd.Categorical([3, 1, 3], categories=[1, 3], ordered=True),
+    })
+    cache.store('entry', df)
+    pd.testing.assert_frame_equal(cache.load('entry'), df)
+
+
+def test_files_with_text_columns_are_read_from_the_cache(tmp_path, monkeypatch):
+    path = tmp_path / 'data.csv'
+    path.write_text('x,y,name\n1,2,a\n3,4,b\n')
+    args = {'sep': ',', 'engine': 'c', 'usecols': [0, 1, 2]}
+    cache = plotme.FileCache(str(tmp_path / 'cache'))
+    parsed = plotme.read_data_file(str(path), args, cache)
+
+    monkeypatch.setattr(plotme, 'read_table', None)
+    pd.testing.assert_frame_equal(plotme.read_data_file(str(path), args, cache), parsed)
+
+
+def test_streamed_files_are_read_like_the_first_one(tmp_path, monkeypatch):
+    files = []
+    for i in range(3):
+        path = tmp_path / f'data{i}.csv'
+        path.write_text('x,y\n' + ''.join(f'{j},{j * i}.5\n' for j in range(10)))
+        files.append(str(path))
+    cache = str(tmp_path / 'cache')
+    frames = []
+    readChunks = plotme.Plot.readChunks
+
+    def spy(self, fname):
+        chunks = list(readChunks(self, fname))
+        frames.extend(chunks)
+        return chunks
+
+    monkeypatch.setattr(plotme.Plot, 'readChunks', spy)
+    plotme.Plot(fileName=files, y='2', sd=True, stream=True, dtype='float32', cache=cache, dontSave=True).plotControl()
+    assert len(frames) == len(files) - 1
+    assert all(df.iloc[:, 1].dtype == np.float32 for df in frames)
+
+    # the files that were streamed are in the cache under the same entries an in-memory read uses
+    monkeypatch.setattr(plotme, 'read_table', None)
+    plot = plotme.Plot(fileName=files, y='2', sd=True, dtype='float32', cache=cache, dontSave=True)
+    assert all(df.iloc[:, 1].dtype == np.float32 for df in plot.data)
+    assert len([name for name in os.listdir(cache) if name.endswith('.npz')]) == len(files)
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+import plotme
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Records which of the plot methods plotControl calls"""
+    called = []
+    for name in ('plotSD', 'plotLine', 'plotScatter', 'plotBar', 'plotPie'):
+        monkeypatch.setattr(plotme.Plot, name, lambda self, *args, name=name: called.append(name))
+    return called
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({'x': range(10), 'y': [float(i * i) for i in range(10)]})
+
+
+@pytest.mark.parametrize('graphType', ['line', 'scatter', 'bar', 'pie'])
+def test_single_file_reaches_its_graph_type(data, calls, graphType):
+    # the default window is 1, which the baseline sent to plotSD as well
+    plotme.Plot(data=data, graphType=graphType, dontSave=True).plotControl()
+    assert calls == ['plot' + graphType.capitalize()]
+
+
+@pytest.mark.parametrize('argv', [[], ['-w', '1']])
+def test_default_window_of_the_command_line_isnt_an_average(tmp_path, calls, argv):
+    path = tmp_path / 'data.csv'
+    path.write_text('x,y\n1,2\n3,4\n')
+    plotme.Plot(cmd=True, argv=['-f', str(path), '-g', 'scatter', '-ds'] + argv).plotControl()
+    assert calls == ['plotScatter']
+
+
+@pytest.mark.parametrize('options', [{'sd': True}, {'w': 5}])
+def test_shadow_and_window_use_plot_sd(data, calls, options):
+    plotme.Plot(data=data, dontSave=True, **options).plotControl()
+    assert calls == ['plotSD']
+
+
+@pytest.mark.parametrize('graphType', ['line', 'bar', 'pie'])
+def test_density_is_only_for_scatter_plots(data, calls, graphType):
+    with pytest.raises(Exception, match='scatter'):
+        plotme.Plot(data=data, graphType=graphType, density=True, dontSave=True).plotControl()
+    assert calls == []
+
+
+def test_align_needs_a_shadow_or_a_window(data, calls):
+    with pytest.raises(Exception, match='aligned'):
+        plotme.Plot(data=data, align='union', dontSave=True).plotControl()
+    assert calls == []
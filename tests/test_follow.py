@@ -0,0 +1,27 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import plotme
+
+# files that are being written, but have no rows yet
+STARTS = {'empty': '', 'header': 'step,value\n', 'comments': '# step,value\n'}
+
+
+@pytest.mark.parametrize('kind', sorted(STARTS))
+def test_files_without_rows_are_read_on_the_next_polls(tmp_path, kind):
+    path = tmp_path / 'log.csv'
+    path.write_text(STARTS[kind])
+    plot = plotme.Plot(fileName=[str(path)], y='2', follow=0.01, dontSave=True)
+    plot.checkConditions()
+    fig, ax1 = plt.subplots()
+    artists = plot.drawFollowed(ax1)
+
+    with open(path, 'a') as f:
+        f.write(('step,value\n' if kind != 'header' else '') + '0,1.5\n1,2.5\n')
+    plot.followFiles(fig, ax1, artists, refreshes=1)
+    plt.close(fig)
+
+    np.testing.assert_allclose(plot.followed.rows[0].view(), [[0, 1.5], [1, 2.5]])
+    assert ax1.get_xlabel() == 'step'
+    assert [text.get_text() for text in ax1.get_legend().get_texts()] == ['value']
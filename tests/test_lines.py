@@ -0,0 +1,39 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+import plotme
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({'x': range(50), **{f'y{i}': np.arange(50.0) * i for i in range(20)}})
+
+
+def markers(plot):
+    fig, ax1 = plt.subplots()
+    plot.plotLine(plot.data[0], fig, ax1)
+    plt.close(fig)
+    return fig, [line.get_marker() for line in ax1.get_lines()]
+
+
+def test_lines_have_no_markers_by_default(data):
+    fig, drawn = markers(plotme.Plot(data=data, y='2-21', figSize='4,3', dontSave=True))
+    assert drawn == []
+    assert tuple(fig.get_size_inches()) == (4, 3)
+
+
+def test_given_symbols_are_drawn(data):
+    _, drawn = markers(plotme.Plot(data=data, y='2,3', symbols='.v', dontSave=True))
+    assert drawn == ['.', 'v']
+
+
+@pytest.mark.parametrize('x', [pd.date_range('2024-01-01', periods=1000, freq='h'), [f'run{i}' for i in range(1000)]])
+def test_lines_over_dates_and_text_are_downsampled(x):
+    data = pd.DataFrame({'x': x, 'y': np.sin(np.arange(1000) / 10)})
+    plot = plotme.Plot(data=data, y='2', downsample=100, dontSave=True)
+    fig, ax1 = plt.subplots()
+    plot.plotLine(plot.data[0], fig, ax1)
+    plt.close(fig)
+    assert len(ax1.get_lines()[0].get_xdata()) == 100
@@ -0,0 +1,74 @@
+import pytest
+
+import plotme
+
+PLAIN = 'x,y,name\n1,2,a\n3,4,b\n'
+# files with the same two rows, whose lines the parser doesn't count one by one
+UNUSUAL = {
+    'spaces': 'x,y,name\n1,2,a\n   \n3,4,b\n',
+    'quoted': 'x,y,name\n1,2,"a\nb"\n3,4,c\n',
+    'carriage': 'x,y,name\r1,2,a\r3,4,b\r',
+}
+
+
+def write(path, text):
+    with open(path, 'w', newline='') as f:
+        f.write(text)
+    return str(path)
+
+
+@pytest.mark.parametrize('kind', sorted(UNUSUAL))
+def test_valid_files_are_not_rejected(tmp_path, kind):
+    files = [write(tmp_path / 'plain.csv', PLAIN), write(tmp_path / f'{kind}.csv', UNUSUAL[kind])]
+    with pytest.warns(UserWarning, match='different numbers of rows'):
+        plot = plotme.Plot(fileName=files, y='2', sd=True, countLines=True, dontSave=True)
+    assert [len(df) for df in plot.data] == [2, 2]
+    plot.plotControl()
+
+
+def test_different_rows_still_fail_after_parsing(tmp_path):
+    files = [write(tmp_path / 'plain.csv', PLAIN), write(tmp_path / 'longer.csv', PLAIN + '5,6,c\n')]
+    with pytest.warns(UserWarning, match='different numbers of rows'):
+        plot = plotme.Plot(fileName=files, y='2', sd=True, countLines=True, dontSave=True)
+    with pytest.raises(Exception, match='different numbers of rows'):
+        plot.plotControl()
+
+
+def test_lines_are_only_counted_when_asked(tmp_path, monkeypatch):
+    files = [write(tmp_path / 'plain.csv', PLAIN), write(tmp_path / 'longer.csv', PLAIN + '5,6,c\n')]
+
+    def fail(*args, **kwargs):
+        raise AssertionError('the lines were counted')
+
+    monkeypatch.setattr(plotme, 'count_rows', fail)
+    plot = plotme.Plot(fileName=files, y='2', sd=True, dontSave=True)
+    assert [len(df) for df in plot.data] == [2, 3]
+
+
+def test_wrong_columns_fail_before_parsing(tmp_path, monkeypatch):
+    files = [write(tmp_path / 'plain.csv', PLAIN)]
+    monkeypatch.setattr(plotme, 'read_data_file', None)
+    with pytest.raises(Exception, match="weren't found"):
+        plotme.Plot(fileName=files, y='5', dontSave=True)
+
+
+def test_cached_files_are_not_checked(tmp_path, monkeypatch):
+    files = [write(tmp_path / f'data{i}.csv', PLAIN.replace(',a', ',1').replace(',b', ',2')) for i in range(2)]
+    cache = str(tmp_path / 'cache')
+    plotme.Plot(fileName=files, y='2', sd=True, cache=cache, countLines=True, dontSave=True)
+
+    def fail(*args, **kwargs):
+        raise AssertionError('the file was scanned')
+
+    monkeypatch.setattr(plotme, 'count_rows', fail)
+    monkeypatch.setattr(plotme, 'read_table', fail)
+    plot = plotme.Plot(fileName=files, y='2', sd=True, cache=cache, countLines=True, dontSave=True)
+    assert [len(df) for df in plot.data] == [2, 2]
+
+
+def test_reading_again_reads_the_same_columns(tmp_path):
+    files = [write(tmp_path / 'plain.csv', 'w,x,y\n0,1,2\n0,3,4\n')]
+    plot = plotme.Plot(fileName=files, x='2', y='3', dontSave=True)
+    for data in (plot.data, plot.openFile(files)):
+        assert list(data[0].columns) == ['x', 'y']
+    assert (plot.x, plot.y, plot.xPos, plot.yPos) == (1, [2], 0, [1])
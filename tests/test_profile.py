@@ -0,0 +1,35 @@
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+import plotme
+
+
+@pytest.fixture
+def data():
+    return pd.DataFrame({'x': range(10), 'y': [float(i * i) for i in range(10)]})
+
+
+def test_the_tracing_started_by_the_profiler_is_stopped(data, tmp_path):
+    assert not tracemalloc.is_tracing()
+    plot = plotme.Plot(data=data, dontSave=True, profile=str(tmp_path / 'profile.json'))
+    assert tracemalloc.is_tracing()
+    plot.plotControl()
+    assert not tracemalloc.is_tracing()
+
+
+def test_a_failed_plot_stops_the_tracing(data):
+    plot = plotme.Plot(data=data, graphType='bar', density=True, dontSave=True, profile=True)
+    with pytest.raises(Exception, match='scatter'):
+        plot.plotControl()
+    assert not tracemalloc.is_tracing()
+
+
+def test_the_tracing_of_the_caller_is_kept(data, tmp_path):
+    tracemalloc.start()
+    try:
+        plotme.Plot(data=data, dontSave=True, profile=str(tmp_path / 'profile.json')).plotControl()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import plotme
+
+ROWS = 5000
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(3):
+        rng = np.random.default_rng(i)
+        df = pd.DataFrame({'step': np.arange(ROWS), 'a': rng.normal(size=ROWS).cumsum(), 'b': rng.random(ROWS)})
+        path = tmp_path / f'data{i}.csv'
+        df.to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Records the arguments of every read of plotme"""
+    calls = []
+    read_table = plotme.read_table
+
+    def spy(fname, **kwargs):
+        calls.append(kwargs)
+        return read_table(fname, **kwargs)
+
+    monkeypatch.setattr(plotme, 'read_table', spy)
+    return calls
+
+
+def test_streamed_areas_never_read_whole_files(files, reads):
+    plot = plotme.Plot(fileName=files, y='2,3', auc=True, stream=True, chunkSize=1000)
+    plot.plotControl()
+    assert len(plot.data[0]) <= plotme.PREFLIGHT_ROWS
+    assert reads
+    assert all(call.get('nrows') or call.get('chunksize') for call in reads)
+
+
+def test_streamed_areas_match_the_files_in_memory(files):
+    plot = plotme.Plot(fileName=files, y='2,3', auc=True, stream=True, chunkSize=1000)
+    streamed = plotme.Integral(file=plot.files, y=plot.yPos, x=plot.xPos, chunkSize=plot.chunkSize,
+                               readArgs=plot.readArgs).integrate_files()
+
+    data = plotme.Plot(fileName=files, y='2,3', auc=True)
+    np.testing.assert_allclose(streamed, plotme.Integral(file=data.data, y=data.yPos, x=data.xPos).integrate_files())
+
+
+def test_stats_never_read_whole_files(files, reads):
+    plot = plotme.Plot(fileName=files, y='2,3', stats=True, chunkSize=1000)
+    plot.plotControl()
+    assert len(plot.data[0]) <= plotme.PREFLIGHT_ROWS
+    assert all(call.get('nrows') or call.get('chunksize') for call in reads)
+    # describeFiles is the only one that reads the files in full, each of them once
+    assert sum(call.get('chunksize') is not None for call in reads) == len(files)
+
+    data = pd.concat([pd.read_csv(fname) for fname in files])
+    np.testing.assert_allclose(plot.statistics.loc['mean', ['a', 'b']], data[['a', 'b']].mean())
+
+
+def test_streamed_bootstrap_band_is_rejected(files):
+    plot = plotme.Plot(fileName=files, y='2', sd=True, stream=True, band='bootstrap', dontSave=True)
+    with pytest.raises(Exception, match='bootstrap'):
+        plot.plotControl()
+
+
+def test_streamed_quantiles_are_exact_in_bounded_memory(files, monkeypatch):
+    # a budget of 300 values is 50 rows of the 3 files and 2 columns at a time
+    monkeypatch.setattr(plotme, 'QUANTILE_BLOCK', 300)
+    held = []
+    nan_quantiles = plotme.nan_quantiles
+
+    def spy(values, qs):
+        held.append(values.size)
+        return nan_quantiles(values, qs)
+
+    monkeypatch.setattr(plotme, 'nan_quantiles', spy)
+    plot = plotme.Plot(fileName=files, y='2,3', sd=True, stream=True, chunkSize=700, band='quantile', dontSave=True)
+    stats = plot.streamStats(plot.yPos)
+
+    assert len(held) == ROWS // 50
+    assert max(held) <= 300
+    values = np.stack([pd.read_csv(fname).iloc[:, [1, 2]].to_numpy() for fname in files])
+    expected = np.percentile(values, [25, 50, 75], axis=0)
+    for i, column in enumerate(stats):
+        np.testing.assert_allclose(column['lower'], expected[0, :, i])
+        np.testing.assert_allclose(column['mean'], expected[1, :, i])
+        np.testing.assert_allclose(column['upper'], expected[2, :, i])
+
+
+def test_streamed_quantiles_check_the_rows(files, tmp_path):
+    longer = tmp_path / 'longer.csv'
+    pd.concat([pd.read_csv(files[0])] * 2).to_csv(longer, index=False)
+    plot = plotme.Plot(fileName=files + [str(longer)], y='2', sd=True, stream=True, band='quantile', dontSave=True,
+                       preflight=False)
+    with pytest.raises(Exception, match='different numbers of rows'):
+        plot.plotControl()